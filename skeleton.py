@@ -10,10 +10,119 @@ TODO: Implement all the classes and methods following the specifications
 # DO NOT MODIFY THE IMPORT
 import datetime
 
+# Optional subsystems (storage, exporters, services, profiling) import their
+# modules inside the functions that use them so that main() starts quickly.
+STARTUP_TARGET_MS = 50  # Target cumulative import time of this module
+EAGER_IMPORT_BLOCKLIST = (
+    "argparse", "asyncio", "bisect", "cProfile", "csv", "gzip", "heapq", "http.server",
+    "json", "mmap", "multiprocessing", "random", "sqlite3", "struct", "threading",
+    "unicodedata", "weakref",
+)
+
+
+def normalize_search_key(text):
+    """
+    Normalize text for accent, case and punctuation insensitive search.
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        str: Casefolded text without accents, with punctuation runs collapsed to single spaces
+    """
+    # Check for None
+    if text is None:
+        raise ValueError("Text to normalize cannot be None")
+        
+    # TODO: Implement normalization
+    # HINT: Import unicodedata inside this function and apply unicodedata.normalize("NFKD", text)
+    # HINT: Drop combining marks (unicodedata.combining(ch) != 0), then casefold()
+    # HINT: Replace every run of characters that are not alphanumeric with one space and strip the result
+    pass
+
+
+class StringPool:
+    """Class that interns repeated strings and assigns each distinct value an integer code."""
+    
+    def __init__(self):
+        """Initialize a StringPool object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Keep a dictionary from value to code and a list from code to value
+        pass
+    
+    def intern(self, value):
+        """
+        Get the canonical string object for a value.
+        
+        Args:
+            value: String to intern
+            
+        Returns:
+            str: The pooled string equal to value
+        """
+        # Validate value
+        if not isinstance(value, str):
+            raise ValueError("Only strings can be interned")
+            
+        # TODO: Return the pooled string, adding value to the pool when it is new
+        pass
+    
+    def code(self, value):
+        """
+        Get the integer code of a value.
+        
+        Args:
+            value: String to encode
+            
+        Returns:
+            int: Code of the value, assigned on first use
+        """
+        # TODO: Return the code of value, interning it when it is new
+        pass
+    
+    def lookup_code(self, value):
+        """
+        Get the integer code of a value without adding it.
+        
+        Args:
+            value: String to look up
+            
+        Returns:
+            int: Code of the value if pooled, None otherwise
+        """
+        # TODO: Return the code of value or None if not found
+        return None
+    
+    def value(self, code):
+        """
+        Get the string for a code.
+        
+        Args:
+            code: Integer code
+            
+        Returns:
+            str: The pooled string
+        """
+        # TODO: Return the value stored at index code
+        pass
+    
+    def __len__(self):
+        """
+        Get the number of distinct values.
+        
+        Returns:
+            int: Number of pooled values
+        """
+        # TODO: Return the number of pooled values
+        pass
+
 
 class Book:
     """Base class representing a book in the library."""
     
+    author_pool = StringPool()  # Class variable shared by all books
+    genre_pool = StringPool()  # Class variable shared by all books
+    
     def __init__(self, book_id, title, author, genre, publication_year, is_available=True):
         """
         Initialize a Book object.
@@ -36,6 +145,8 @@ class Book:
             
         # TODO: Initialize all the private attributes
         # HINT: Use double underscore prefix for private attributes (e.g., self.__book_id)
+        # HINT: Store author and genre as integer codes from author_pool and genre_pool
+        # HINT: Initialize the rendered display cache to None
         pass
     
     @property
@@ -54,12 +165,26 @@ class Book:
     def author(self):
         """Get the book author."""
         # TODO: Return the author
+        # HINT: Decode the stored code with author_pool.value()
+        pass
+    
+    @property
+    def author_code(self):
+        """Get the integer code of the book author."""
+        # TODO: Return the stored author code
         pass
     
     @property
     def genre(self):
         """Get the book genre."""
         # TODO: Return the genre
+        # HINT: Decode the stored code with genre_pool.value()
+        pass
+    
+    @property
+    def genre_code(self):
+        """Get the integer code of the book genre."""
+        # TODO: Return the stored genre code
         pass
     
     @property
@@ -78,6 +203,12 @@ class Book:
     def is_available(self, value):
         """Set the book availability status."""
         # TODO: Set the is_available status
+        # HINT: Call _invalidate_display_cache() when the value actually changes
+        pass
+    
+    def _invalidate_display_cache(self):
+        """Discard the cached display_info string."""
+        # TODO: Reset the rendered display cache to None
         pass
     
     def checkout(self):
@@ -89,6 +220,7 @@ class Book:
         """
         # TODO: Implement checkout logic
         # HINT: Only successful if book is currently available
+        # HINT: Call _invalidate_display_cache() when the availability changes
         pass
     
     def return_to_library(self):
@@ -100,6 +232,7 @@ class Book:
         """
         # TODO: Implement return logic
         # HINT: Only successful if book is currently checked out
+        # HINT: Call _invalidate_display_cache() when the availability changes
         pass
     
     def display_info(self):
@@ -111,6 +244,7 @@ class Book:
         """
         # TODO: Return formatted string with book information
         # HINT: Include book_id, title, author, genre, publication_year, and availability status
+        # HINT: Return the cached string when present, otherwise format it once and cache it
         pass
 
 
@@ -149,6 +283,7 @@ class FictionBook(Book):
         """
         # TODO: Override the display_info method to include fiction-specific information
         # HINT: Use super().display_info() to get basic book information
+        # HINT: Cache the combined string so the concatenation only happens once per change
         pass
 
 
@@ -187,13 +322,16 @@ class NonFictionBook(Book):
         """
         # TODO: Override the display_info method to include non-fiction-specific information
         # HINT: Use super().display_info() to get basic book information
+        # HINT: Cache the combined string so the concatenation only happens once per change
         pass
 
 
 class Member:
     """Class representing a library member."""
     
-    def __init__(self, member_id, name, email, books_borrowed=None):
+    MAX_BOOKS = 3  # Limit of the default MaxBooksPolicy used when no policy is given
+    
+    def __init__(self, member_id, name, email, books_borrowed=None, tier="standard", genre_counts=None):
         """
         Initialize a Member object.
         
@@ -202,6 +340,8 @@ class Member:
             name: Name of the member
             email: Email address of the member
             books_borrowed: List of books borrowed by the member
+            tier: Membership tier used by borrow policies
+            genre_counts: Dictionary mapping genre names to borrowed counts for books_borrowed, or None
         """
         # Validate email format, rejecting specific formats as per test requirements
         if (not '@' in email or 
@@ -213,6 +353,10 @@ class Member:
             
         # TODO: Initialize all attributes
         # HINT: Handle default value for books_borrowed
+        # HINT: Initialize the rendered display cache to None
+        # HINT: Keep a borrowed count and a dictionary of borrowed counts per genre code
+        # HINT: Start the borrowed count at len(books_borrowed) so existing loans count against the limits
+        # HINT: Convert genre_counts to codes with Book.genre_pool.intern() to seed the genre counters
         pass
     
     @property
@@ -233,6 +377,31 @@ class Member:
         # TODO: Return the email
         pass
     
+    @property
+    def tier(self):
+        """Get the membership tier."""
+        # TODO: Return the tier
+        pass
+    
+    @property
+    def borrowed_count(self):
+        """Get the number of books currently borrowed."""
+        # TODO: Return the maintained borrowed count without recounting books_borrowed
+        pass
+    
+    def genre_count(self, genre_code):
+        """
+        Get the number of borrowed books of a genre.
+        
+        Args:
+            genre_code: Integer genre code from Book.genre_pool
+            
+        Returns:
+            int: Number of borrowed books with that genre
+        """
+        # TODO: Return the counter for genre_code or 0
+        pass
+    
     @property
     def books_borrowed(self):
         """Get the list of books borrowed by the member."""
@@ -240,20 +409,79 @@ class Member:
         # HINT: Use the copy() method to avoid returning a reference to the original list
         pass
     
-    def borrow_book(self, book):
+    def borrow_book(self, book, policy=None):
         """
         Borrow a book.
         
         Args:
             book: Book object to borrow
+            policy: PolicyEngine deciding the borrow limits, or None for a PolicyEngine([MaxBooksPolicy(MAX_BOOKS)])
             
         Returns:
             bool: True if borrow successful, False otherwise
         """
         # TODO: Implement borrow logic
-        # HINT: Check if member has reached maximum book limit (3)
+        # HINT: Ask policy.allows(self, book) instead of comparing with a limit here; the member only records the borrow
+        # HINT: Create the default PolicyEngine once and reuse it when policy is None
         # HINT: Check if the book is available
         # HINT: Use book.checkout() method
+        # HINT: Update the borrowed count and the genre counter of book.genre_code on success
+        # HINT: Call _invalidate_display_cache() after books_borrowed changes
+        pass
+    
+    def borrow_books(self, books, policy=None):
+        """
+        Borrow several books at once with all-or-nothing semantics.
+        
+        Args:
+            books: List of Book objects to borrow
+            policy: PolicyEngine deciding the borrow limits, or None for a PolicyEngine([MaxBooksPolicy(MAX_BOOKS)])
+            
+        Returns:
+            bool: True if every book was borrowed, False if none were
+        """
+        # Check for None
+        if books is None:
+            raise ValueError("Books to borrow cannot be None")
+            
+        # TODO: Implement batch borrow logic
+        # HINT: Ask policy.allows_batch(self, books) once for the whole batch before touching any book
+        # HINT: Reject batches that contain the same book twice or an unavailable book
+        # HINT: If a book.checkout() call fails part way, return the already checked out books and return False
+        # HINT: Update the borrowed count and the genre counters once for the whole batch on success
+        pass
+    
+    def borrow_copy(self, inventory, policy=None):
+        """
+        Borrow any free copy of a multi-copy title.
+        
+        Args:
+            inventory: CopyInventory object of the title
+            policy: PolicyEngine deciding the borrow limits, or None for the default engine used by borrow_book()
+            
+        Returns:
+            str: Copy ID of the borrowed copy, or None if the borrow failed
+        """
+        # TODO: Implement copy borrow logic
+        # HINT: Ask policy.allows(self, inventory.book) so each copy counts against the limits like a book
+        # HINT: Call inventory.checkout_copy() instead of book.checkout(), since the book is the shared record
+        # HINT: Record inventory.copy_id(index) in books_borrowed and update the borrowed count and genre counter
+        pass
+    
+    def return_copy(self, inventory, copy_id):
+        """
+        Return a borrowed copy of a multi-copy title.
+        
+        Args:
+            inventory: CopyInventory object of the title
+            copy_id: Copy ID returned by borrow_copy()
+            
+        Returns:
+            bool: True if return successful, False otherwise
+        """
+        # TODO: Implement copy return logic
+        # HINT: Check that copy_id is in books_borrowed, then call inventory.return_copy() with its index
+        # HINT: Decrement the borrowed count and the genre counter, and call _invalidate_display_cache()
         pass
     
     def return_book(self, book):
@@ -269,6 +497,28 @@ class Member:
         # TODO: Implement return logic
         # HINT: Check if the member has borrowed this book
         # HINT: Use book.return_to_library() method
+        # HINT: Decrement the borrowed count and the genre counter of book.genre_code on success
+        # HINT: Call _invalidate_display_cache() after books_borrowed changes
+        pass
+    
+    def return_books(self, books):
+        """
+        Return several borrowed books at once with all-or-nothing semantics.
+        
+        Args:
+            books: List of Book objects to return
+            
+        Returns:
+            bool: True if every book was returned, False if none were
+        """
+        # Check for None
+        if books is None:
+            raise ValueError("Books to return cannot be None")
+            
+        # TODO: Implement batch return logic
+        # HINT: Check that every book is in books_borrowed before returning any of them
+        # HINT: Decrement the borrowed count and the genre counters once for the whole batch
+        # HINT: Call _invalidate_display_cache() once after the batch
         pass
     
     def display_info(self):
@@ -280,221 +530,3691 @@ class Member:
         """
         # TODO: Return formatted string with member information
         # HINT: Include member_id, name, email, and number of books borrowed
+        # HINT: Return the cached string when present, otherwise format it once and cache it
+        pass
+    
+    def _invalidate_display_cache(self):
+        """Discard the cached display_info string."""
+        # TODO: Reset the rendered display cache to None
         pass
 
 
-# DO NOT MODIFY THESE CLASS VARIABLES
-class Library:
-    """Class representing a library system."""
-    
-    book_count = 0  # Class variable to track total books
-    member_count = 0  # Class variable to track total members
+class BorrowPolicy:
+    """Base class for a rule deciding whether a member may borrow a book."""
     
-    def __init__(self, name, address):
+    def allows(self, member, book, pending=None):
         """
-        Initialize a Library object.
+        Decide whether a checkout is allowed.
         
         Args:
-            name: Name of the library
-            address: Address of the library
+            member: Member object checking out the book
+            book: Book object being checked out
+            pending: Dictionary of counts for books earlier in the same batch, keyed by "total" and by genre code, or None
+            
+        Returns:
+            bool: True if the rule allows the checkout, False otherwise
         """
-        # TODO: Initialize all attributes
-        # HINT: Create dictionaries to store books and members
-        pass
-    
-    @property
-    def name(self):
-        """Get the library name."""
-        # TODO: Return the name
-        pass
-    
-    @property
-    def address(self):
-        """Get the library address."""
-        # TODO: Return the address
-        pass
+        raise NotImplementedError("Subclasses must implement allows()")
+
+
+class MaxBooksPolicy(BorrowPolicy):
+    """Policy limiting the total number of borrowed books, inherits from BorrowPolicy."""
     
-    @staticmethod
-    def get_book_count():
+    def __init__(self, limit):
         """
-        Get the total number of books.
+        Initialize a MaxBooksPolicy object.
         
-        Returns:
-            int: Total number of books
+        Args:
+            limit: Maximum number of borrowed books
         """
-        # TODO: Return the book_count class variable
+        # Validate limit
+        if not isinstance(limit, int) or limit < 0:
+            raise ValueError("Limit must be a non-negative integer")
+            
+        # TODO: Initialize all the private attributes
         pass
     
-    @staticmethod
-    def get_member_count():
+    def allows(self, member, book, pending=None):
         """
-        Get the total number of members.
+        Decide whether a checkout is allowed.
         
+        Args:
+            member: Member object checking out the book
+            book: Book object being checked out
+            pending: Dictionary of counts for books earlier in the same batch, or None
+            
         Returns:
-            int: Total number of members
+            bool: True if the member is below the limit, False otherwise
         """
-        # TODO: Return the member_count class variable
+        # TODO: Compare member.borrowed_count plus pending["total"] with the limit
         pass
+
+
+class TierLimitPolicy(BorrowPolicy):
+    """Policy limiting borrowed books per membership tier, inherits from BorrowPolicy."""
     
-    def add_book(self, book):
+    def __init__(self, limits, default_limit=3):
         """
-        Add a book to the library.
+        Initialize a TierLimitPolicy object.
         
         Args:
-            book: Book object to add
-            
-        Returns:
-            bool: True if addition successful, False otherwise
+            limits: Dictionary mapping tier names to borrow limits
+            default_limit: Limit for tiers not in limits
         """
-        # TODO: Implement add book logic
-        # HINT: Check if book already exists before adding
-        # HINT: Increment book_count class variable
+        # Check for None
+        if limits is None:
+            raise ValueError("Tier limits cannot be None")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Store a copy of the limits dictionary
         pass
     
-    def add_member(self, member):
+    def allows(self, member, book, pending=None):
         """
-        Add a member to the library.
+        Decide whether a checkout is allowed.
         
         Args:
-            member: Member object to add
+            member: Member object checking out the book
+            book: Book object being checked out
+            pending: Dictionary of counts for books earlier in the same batch, or None
             
         Returns:
-            bool: True if addition successful, False otherwise
+            bool: True if the member is below the limit of their tier, False otherwise
         """
-        # TODO: Implement add member logic
-        # HINT: Check if member already exists before adding
-        # HINT: Increment member_count class variable
+        # TODO: Look up the limit of member.tier and compare with member.borrowed_count plus pending["total"]
         pass
+
+
+class GenreLimitPolicy(BorrowPolicy):
+    """Policy limiting borrowed books of one genre, inherits from BorrowPolicy."""
     
-    def checkout_book(self, book_id, member_id):
+    def __init__(self, genre, limit):
         """
-        Check out a book to a member.
+        Initialize a GenreLimitPolicy object.
         
         Args:
-            book_id: ID of the book to check out
-            member_id: ID of the member checking out the book
-            
-        Returns:
-            bool: True if checkout successful, False otherwise
+            genre: Genre the limit applies to
+            limit: Maximum number of borrowed books of that genre
         """
-        # TODO: Implement checkout logic
-        # HINT: Check if book and member exist
-        # HINT: Use member.borrow_book() method
+        # Validate limit
+        if not isinstance(limit, int) or limit < 0:
+            raise ValueError("Limit must be a non-negative integer")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Store the genre as its code from Book.genre_pool
         pass
     
-    def return_book(self, book_id, member_id):
+    def allows(self, member, book, pending=None):
         """
-        Return a book to the library.
+        Decide whether a checkout is allowed.
         
         Args:
-            book_id: ID of the book to return
-            member_id: ID of the member returning the book
+            member: Member object checking out the book
+            book: Book object being checked out
+            pending: Dictionary of counts for books earlier in the same batch, or None
             
         Returns:
-            bool: True if return successful, False otherwise
+            bool: True if the book is another genre or the member is below the limit, False otherwise
         """
-        # TODO: Implement return logic
-        # HINT: Check if book and member exist
-        # HINT: Use member.return_book() method
+        # TODO: Compare book.genre_code with the stored code, then check member.genre_count() plus the pending count of that code
         pass
+
+
+class PolicyEngine:
+    """Class evaluating a set of borrow policies for one library branch."""
     
-    def get_available_books(self):
+    def __init__(self, policies=None):
         """
-        Get all available books.
+        Initialize a PolicyEngine object.
         
-        Returns:
-            dict: Dictionary of available books
+        Args:
+            policies: List of BorrowPolicy objects
         """
-        # TODO: Return a dictionary of all available books
-        # HINT: Use dictionary comprehension
+        # TODO: Initialize all the private attributes
+        # HINT: Handle default value for policies
+        # HINT: Keep GenreLimitPolicy rules in a dictionary by genre code so only the rule for the book's genre runs
         pass
     
-    def search_book_by_title(self, title):
+    def add_policy(self, policy):
         """
-        Search for books by title.
+        Add a policy to the engine.
         
         Args:
-            title: Title to search for
-            
-        Returns:
-            dict: Dictionary of matching books
+            policy: BorrowPolicy object to add
         """
-        # Check for None
-        if title is None:
-            raise ValueError("Search title cannot be None")
+        # Validate policy
+        if not isinstance(policy, BorrowPolicy):
+            raise ValueError("Policy must be a BorrowPolicy")
             
-        # TODO: Return a dictionary of books with matching titles
-        # HINT: Use dictionary comprehension and case-insensitive search
+        # TODO: Store the policy
         pass
     
-    def search_book_by_author(self, author):
+    def allows(self, member, book, pending=None):
         """
-        Search for books by author.
+        Decide whether a checkout is allowed by every policy.
         
         Args:
-            author: Author to search for
+            member: Member object checking out the book
+            book: Book object being checked out
+            pending: Dictionary of counts for books earlier in the same batch, or None
             
         Returns:
-            dict: Dictionary of matching books
+            bool: True if all policies allow the checkout, False otherwise
         """
-        # Check for None
-        if author is None:
-            raise ValueError("Search author cannot be None")
-            
-        # TODO: Return a dictionary of books with matching authors
-        # HINT: Use the partial word matching for author search
+        # TODO: Return False as soon as one policy rejects the checkout
         pass
     
-    def get_book(self, book_id):
+    def allows_batch(self, member, books):
         """
-        Get a book by ID.
+        Decide whether a whole batch of checkouts is allowed by every policy.
         
         Args:
-            book_id: ID of the book to get
+            member: Member object checking out the books
+            books: List of Book objects being checked out
             
         Returns:
-            Book: Book object if found, None otherwise
+            bool: True if every book of the batch is allowed, False otherwise
         """
-        # TODO: Return the book with the given ID or None if not found
-        return None
+        # TODO: Call allows() for each book with a pending dictionary counting the books before it
+        # HINT: Increment pending["total"] and pending[book.genre_code] after each allowed book
+        pass
     
-    def get_member(self, member_id):
+    def at_limit(self, member):
         """
-        Get a member by ID.
+        Decide whether a member has reached a limit that blocks every further checkout.
         
         Args:
-            member_id: ID of the member to get
+            member: Member object to check
             
         Returns:
-            Member: Member object if found, None otherwise
+            bool: True if some policy rejects the member whatever the book, False otherwise
         """
-        # TODO: Return the member with the given ID or None if not found
-        return None
+        # TODO: Return True if any policy other than a GenreLimitPolicy rejects allows(member, None)
+        # HINT: Genre limits only block books of one genre, so they never put a member at the limit
+        pass
+
+
+class CopyInventory:
+    """Class tracking the physical copies of one title with a shared bibliographic record."""
     
-    def get_all_books(self):
+    COPY_SEPARATOR = ":"
+    
+    def __init__(self, book, copies=1):
         """
-        Get all books.
+        Initialize a CopyInventory object.
         
-        Returns:
-            dict: Dictionary of all books
+        Args:
+            book: Book object holding the shared bibliographic record
+            copies: Number of physical copies of the title
         """
-        # TODO: Return a copy of the books dictionary
+        # Validate copies
+        if not isinstance(copies, int) or copies <= 0:
+            raise ValueError("Number of copies must be a positive integer")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Store availability as an int bitset where bit i is set while copy i is on the shelf
+        # HINT: Keep a list of free copy indexes used as a stack so a free copy is found in O(1)
+        pass
+    
+    @property
+    def book(self):
+        """Get the shared bibliographic record."""
+        # TODO: Return the book
+        pass
+    
+    @property
+    def total_copies(self):
+        """Get the number of physical copies."""
+        # TODO: Return the total number of copies
+        pass
+    
+    @property
+    def available_copies(self):
+        """Get the number of copies on the shelf."""
+        # TODO: Return the length of the free copy stack
+        pass
+    
+    def copy_id(self, index):
+        """
+        Build the ID of a physical copy.
+        
+        Args:
+            index: Index of the copy
+            
+        Returns:
+            str: Copy ID in the form "<book_id>:<index>"
+        """
+        # TODO: Join the book_id and index with COPY_SEPARATOR
+        pass
+    
+    def add_copies(self, count):
+        """
+        Add physical copies of the title.
+        
+        Args:
+            count: Number of copies to add
+            
+        Returns:
+            int: New total number of copies
+        """
+        # Validate count
+        if not isinstance(count, int) or count <= 0:
+            raise ValueError("Number of copies must be a positive integer")
+            
+        # TODO: Push the new copy indexes on the free stack and set their bits
+        pass
+    
+    def is_copy_available(self, index):
+        """
+        Check whether a copy is on the shelf.
+        
+        Args:
+            index: Index of the copy
+            
+        Returns:
+            bool: True if the copy is available, False otherwise
+        """
+        # TODO: Test bit index of the availability bitset
+        pass
+    
+    def checkout_copy(self):
+        """
+        Check out any free copy.
+        
+        Returns:
+            int: Index of the checked out copy, or None if no copy is free
+        """
+        # TODO: Pop a free index from the stack and clear its bit
+        # HINT: Keep the book's is_available flag equal to available_copies > 0 through its setter, never book.checkout()
+        pass
+    
+    def return_copy(self, index):
+        """
+        Return a copy to the shelf.
+        
+        Args:
+            index: Index of the copy
+            
+        Returns:
+            bool: True if return successful, False otherwise
+        """
+        # TODO: Set the bit and push the index back on the free stack
+        # HINT: Only successful if the copy exists and is currently checked out
+        pass
+
+
+class Loan:
+    """Class representing a single active loan of a book to a member."""
+    
+    __slots__ = ("book_id", "member_id", "checkout_time", "due_date")
+    
+    def __init__(self, book_id, member_id, checkout_time, due_date):
+        """
+        Initialize a Loan object.
+        
+        Args:
+            book_id: ID of the borrowed book
+            member_id: ID of the borrowing member
+            checkout_time: datetime when the book was checked out
+            due_date: datetime when the book must be returned
+        """
+        # Validate dates
+        if due_date < checkout_time:
+            raise ValueError("Due date cannot be before checkout time")
+            
+        # TODO: Initialize all the slot attributes
+        pass
+    
+    def is_overdue(self, now):
+        """
+        Check whether the loan is overdue.
+        
+        Args:
+            now: datetime to compare the due date against
+            
+        Returns:
+            bool: True if the due date has passed, False otherwise
+        """
+        # TODO: Compare due_date with now
+        pass
+
+
+class LoanTracker:
+    """Class that keeps active loans in a min-heap ordered by due date."""
+    
+    def __init__(self, loan_period_days=14):
+        """
+        Initialize a LoanTracker object.
+        
+        Args:
+            loan_period_days: Number of days a book may be kept
+        """
+        # Validate loan_period_days
+        if not isinstance(loan_period_days, int) or loan_period_days <= 0:
+            raise ValueError("Loan period must be a positive integer")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Keep a heap list of (due_date, sequence, Loan) tuples and a dictionary of active loans by book_id
+        # HINT: Store the loan period as a datetime.timedelta
+        pass
+    
+    def open_loan(self, book_id, member_id, checkout_time=None):
+        """
+        Record a new loan.
+        
+        Args:
+            book_id: ID of the borrowed book
+            member_id: ID of the borrowing member
+            checkout_time: datetime of the checkout, or None for now
+            
+        Returns:
+            Loan: The recorded loan
+        """
+        # TODO: Create a Loan, add it to the active loans and push it onto the heap
+        # HINT: Import heapq inside this method and use heapq.heappush()
+        # HINT: Use datetime.datetime.now() when checkout_time is None
+        pass
+    
+    def close_loan(self, book_id):
+        """
+        Close the active loan of a book.
+        
+        Args:
+            book_id: ID of the returned book
+            
+        Returns:
+            Loan: The closed loan if found, None otherwise
+        """
+        # TODO: Remove the loan from the active loans dictionary
+        # HINT: Leave the heap entry in place and skip it lazily, by identity, when it reaches the top
+        # HINT: Rebuild the heap with heapq.heapify() once stale entries outnumber active loans
+        pass
+    
+    def get_loan(self, book_id):
+        """
+        Get the active loan of a book.
+        
+        Args:
+            book_id: ID of the borrowed book
+            
+        Returns:
+            Loan: Loan object if found, None otherwise
+        """
+        # TODO: Return the active loan for book_id or None if not found
+        return None
+    
+    def due_before(self, deadline):
+        """
+        Get active loans due on or before a deadline.
+        
+        Args:
+            deadline: datetime limit for the due date
+            
+        Returns:
+            list: Loans sorted by due date
+        """
+        # TODO: Collect loans whose due date is not after deadline
+        # HINT: Walk the heap as a tree from index 0 and only descend into children (2i+1, 2i+2) that are due by deadline
+        # HINT: Skip stale entries by identity, with active.get(loan.book_id) is not loan, since a book checked out again has a new loan under the same key
+        pass
+    
+    def get_overdue(self, now=None):
+        """
+        Get loans that are overdue.
+        
+        Args:
+            now: datetime to compare against, or None for now
+            
+        Returns:
+            list: Overdue loans sorted by due date
+        """
+        # TODO: Return due_before(now)
+        pass
+    
+    def get_due_within(self, hours, now=None):
+        """
+        Get loans that are not yet overdue but come due within a number of hours.
+        
+        Args:
+            hours: Size of the look-ahead window in hours
+            now: datetime the window starts at, or None for now
+            
+        Returns:
+            list: Loans due after now and on or before now + hours, sorted by due date
+        """
+        # Validate hours
+        if hours < 0:
+            raise ValueError("Hours cannot be negative")
+            
+        # TODO: Return the loans of due_before(now + datetime.timedelta(hours=hours)) whose due date is after now
+        # HINT: Overdue loans belong to get_overdue(), so the window is (now, now + hours]
+        pass
+    
+    def __len__(self):
+        """
+        Get the number of active loans.
+        
+        Returns:
+            int: Number of active loans
+        """
+        # TODO: Return the size of the active loans dictionary
+        pass
+
+
+class HoldRegistry:
+    """Class that keeps per-book FIFO hold queues for unavailable books."""
+    
+    def __init__(self):
+        """Initialize a HoldRegistry object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Map each book_id to a dictionary used as an ordered set of member IDs (insertion order is FIFO)
+        # HINT: Map each member_id to a set of book IDs the member is waiting for
+        pass
+    
+    def place_hold(self, book_id, member_id):
+        """
+        Add a member to the end of a book's hold queue.
+        
+        Args:
+            book_id: ID of the book to hold
+            member_id: ID of the member placing the hold
+            
+        Returns:
+            bool: True if the hold was placed, False if the member already holds the book
+        """
+        # TODO: Append the member to the book queue and record the book in the member index
+        pass
+    
+    def cancel_hold(self, book_id, member_id):
+        """
+        Remove a member from a book's hold queue.
+        
+        Args:
+            book_id: ID of the held book
+            member_id: ID of the member cancelling the hold
+            
+        Returns:
+            bool: True if a hold was cancelled, False otherwise
+        """
+        # TODO: Delete the member from the book queue and the book from the member index
+        # HINT: Drop empty queues and empty index entries so the registry stays compact
+        pass
+    
+    def cancel_all(self, member_id):
+        """
+        Cancel every hold placed by a member.
+        
+        Args:
+            member_id: ID of the member
+            
+        Returns:
+            int: Number of holds cancelled
+        """
+        # TODO: Use the member index to cancel only the member's holds
+        pass
+    
+    def next_member(self, book_id):
+        """
+        Remove and return the first member waiting for a book.
+        
+        Args:
+            book_id: ID of the returned book
+            
+        Returns:
+            str: Member ID if someone is waiting, None otherwise
+        """
+        # TODO: Pop the first member of the book queue
+        # HINT: Use next(iter(queue)) to find the oldest entry in O(1)
+        pass
+    
+    def holds_for_member(self, member_id):
+        """
+        Get the books a member is waiting for.
+        
+        Args:
+            member_id: ID of the member
+            
+        Returns:
+            set: Book IDs held by the member
+        """
+        # TODO: Return a copy of the member index entry or an empty set
+        pass
+    
+    def queue_length(self, book_id):
+        """
+        Get the number of members waiting for a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            int: Length of the hold queue
+        """
+        # TODO: Return the length of the book queue or 0
+        pass
+
+
+class ShardedCounter:
+    """Class implementing a counter sharded per thread and summed on read."""
+    
+    def __init__(self):
+        """Initialize a ShardedCounter object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Use a dictionary mapping thread identifiers to that thread's partial count
+        pass
+    
+    def increment(self, amount=1):
+        """
+        Add to the counter from the calling thread.
+        
+        Args:
+            amount: Value to add
+        """
+        # Validate amount
+        if not isinstance(amount, int):
+            raise ValueError("Amount must be an integer")
+            
+        # TODO: Add amount to the shard of the calling thread
+        # HINT: Import threading inside this method and key the shard by threading.get_ident()
+        # HINT: Each thread only writes its own key, so no lock is needed on the write path
+        pass
+    
+    def value(self):
+        """
+        Get the current total.
+        
+        Returns:
+            int: Sum of all shards
+        """
+        # TODO: Return the sum of all shard values
+        # HINT: Iterate over a list() copy of the values since other threads may add shards
+        pass
+
+
+class CounterRegistry:
+    """Class holding named ShardedCounter objects."""
+    
+    def __init__(self):
+        """Initialize a CounterRegistry object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Create a dictionary mapping counter names to ShardedCounter objects
+        pass
+    
+    def counter(self, name):
+        """
+        Get a counter by name, creating it on first use.
+        
+        Args:
+            name: Name of the counter
+            
+        Returns:
+            ShardedCounter: The named counter
+        """
+        # TODO: Return the existing counter or create and store a new one
+        # HINT: Use dict.setdefault() so concurrent first uses share one counter
+        pass
+    
+    def snapshot(self):
+        """
+        Get the current value of every counter.
+        
+        Returns:
+            dict: Dictionary mapping counter names to totals
+        """
+        # TODO: Return a dictionary of counter names and their value()
+        pass
+
+
+global_counters = CounterRegistry()  # Counters aggregated across every Library instance
+
+
+class BookCache:
+    """Class implementing an identity-preserving LRU cache of materialized books."""
+    
+    def __init__(self, capacity=10000):
+        """
+        Initialize a BookCache object.
+        
+        Args:
+            capacity: Maximum number of books kept alive by the cache
+        """
+        # Validate capacity
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("Capacity must be a non-negative integer")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Import collections and weakref inside this method
+        # HINT: Keep strong references in a collections.OrderedDict ordered from least to most recently used
+        # HINT: Keep a weakref.WeakValueDictionary of every materialized book so evicted books still in use are found again
+        # HINT: Keep hit and miss counters
+        pass
+    
+    @property
+    def capacity(self):
+        """Get the maximum number of strongly held books."""
+        # TODO: Return the capacity
+        pass
+    
+    def get(self, book_id):
+        """
+        Get a cached book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            Book: The cached Book object if found, None otherwise
+        """
+        # TODO: Look in the LRU first and move the entry to the end with move_to_end()
+        # HINT: On an LRU miss, check the weak dictionary and re-insert a live book into the LRU
+        pass
+    
+    def put(self, book):
+        """
+        Add a book to the cache.
+        
+        Args:
+            book: Book object to cache
+            
+        Returns:
+            Book: The cached object, which is the existing one if the book is already materialized
+        """
+        # TODO: Return the existing object for book.book_id if one is alive, otherwise store book
+        # HINT: Evict from the front with popitem(last=False) while the LRU is larger than capacity
+        pass
+    
+    def discard(self, book_id):
+        """
+        Remove a book from the cache.
+        
+        Args:
+            book_id: ID of the book
+        """
+        # TODO: Remove book_id from the LRU and the weak dictionary
+        pass
+    
+    def resize(self, capacity):
+        """
+        Change the capacity, evicting books if needed.
+        
+        Args:
+            capacity: New maximum number of strongly held books
+        """
+        # Validate capacity
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("Capacity must be a non-negative integer")
+            
+        # TODO: Store the capacity and evict least recently used books beyond it
+        pass
+    
+    def stats(self):
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict: Dictionary with "size", "capacity", "hits" and "misses"
+        """
+        # TODO: Return the statistics dictionary
+        pass
+    
+    def __len__(self):
+        """
+        Get the number of strongly held books.
+        
+        Returns:
+            int: Size of the LRU
+        """
+        # TODO: Return the size of the LRU
+        pass
+
+
+class StorageBackend:
+    """Base class for persistent storage of library books and members."""
+    
+    def put_book(self, book):
+        """
+        Insert or replace a book.
+        
+        Args:
+            book: Book object to store
+        """
+        raise NotImplementedError("Subclasses must implement put_book()")
+    
+    def put_books(self, books):
+        """
+        Insert or replace many books in one transaction.
+        
+        Args:
+            books: Iterable of Book objects to store
+            
+        Returns:
+            int: Number of books stored
+        """
+        raise NotImplementedError("Subclasses must implement put_books()")
+    
+    def get_book(self, book_id):
+        """
+        Load a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            Book: Book object if found, None otherwise
+        """
+        raise NotImplementedError("Subclasses must implement get_book()")
+    
+    def delete_book(self, book_id):
+        """
+        Delete a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            bool: True if a book was deleted, False otherwise
+        """
+        raise NotImplementedError("Subclasses must implement delete_book()")
+    
+    def iter_books(self):
+        """
+        Iterate over all stored books.
+        
+        Yields:
+            Book: Each stored book
+        """
+        raise NotImplementedError("Subclasses must implement iter_books()")
+    
+    def iter_available_books(self):
+        """
+        Iterate over the stored books that are available.
+        
+        Yields:
+            Book: Each available book
+        """
+        raise NotImplementedError("Subclasses must implement iter_available_books()")
+    
+    def books_by_genre(self, genre):
+        """
+        Find books of a genre.
+        
+        Args:
+            genre: Genre to look for
+            
+        Returns:
+            list: Matching book IDs
+        """
+        raise NotImplementedError("Subclasses must implement books_by_genre()")
+    
+    def set_available(self, book_id, is_available):
+        """
+        Persist the availability of a book.
+        
+        Args:
+            book_id: ID of the book
+            is_available: New availability status
+        """
+        raise NotImplementedError("Subclasses must implement set_available()")
+    
+    def set_available_many(self, book_ids, is_available):
+        """
+        Persist the availability of many books in one transaction.
+        
+        Args:
+            book_ids: IDs of the books
+            is_available: New availability status
+        """
+        raise NotImplementedError("Subclasses must implement set_available_many()")
+    
+    def search_title(self, title):
+        """
+        Find books whose title contains every word of a string, ignoring case.
+        
+        Args:
+            title: Title to search for
+            
+        Returns:
+            list: Matching book IDs
+        """
+        raise NotImplementedError("Subclasses must implement search_title()")
+    
+    def search_author(self, author):
+        """
+        Find books whose author contains every word of a string, ignoring case.
+        
+        Args:
+            author: Author to search for
+            
+        Returns:
+            list: Matching book IDs
+        """
+        raise NotImplementedError("Subclasses must implement search_author()")
+    
+    def books_by_year(self, start_year, end_year):
+        """
+        Find books published in a range of years.
+        
+        Args:
+            start_year: First year of the range
+            end_year: Last year of the range
+            
+        Returns:
+            list: Matching book IDs
+        """
+        raise NotImplementedError("Subclasses must implement books_by_year()")
+    
+    def put_member(self, member):
+        """
+        Insert or replace a member together with the books they borrowed.
+        
+        Args:
+            member: Member object to store
+        """
+        raise NotImplementedError("Subclasses must implement put_member()")
+    
+    def get_member(self, member_id):
+        """
+        Load a member.
+        
+        Args:
+            member_id: ID of the member
+            
+        Returns:
+            Member: Member object if found, None otherwise
+        """
+        raise NotImplementedError("Subclasses must implement get_member()")
+    
+    def iter_members(self):
+        """
+        Iterate over all stored members.
+        
+        Yields:
+            Member: Each stored member
+        """
+        raise NotImplementedError("Subclasses must implement iter_members()")
+    
+    def close(self):
+        """Release any resources held by the backend."""
+        pass
+
+
+class SQLiteBackend(StorageBackend):
+    """Storage backend keeping books and members in an SQLite database, inherits from StorageBackend."""
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS books ("
+        "book_id TEXT PRIMARY KEY, kind TEXT NOT NULL, title TEXT NOT NULL, "
+        "author TEXT NOT NULL, genre TEXT NOT NULL, publication_year INTEGER NOT NULL, "
+        "extra TEXT, is_available INTEGER NOT NULL, title_key TEXT NOT NULL, author_key TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS book_words ("
+        "field TEXT NOT NULL, word TEXT NOT NULL, book_id TEXT NOT NULL, "
+        "PRIMARY KEY (field, word, book_id)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS idx_books_year ON books (publication_year)",
+        "CREATE INDEX IF NOT EXISTS idx_books_genre ON books (genre)",
+        "CREATE INDEX IF NOT EXISTS idx_books_available ON books (book_id) WHERE is_available = 1",
+        "CREATE TABLE IF NOT EXISTS members ("
+        "member_id TEXT PRIMARY KEY, name TEXT NOT NULL, email TEXT NOT NULL, "
+        "tier TEXT NOT NULL DEFAULT 'standard')",
+        "CREATE TABLE IF NOT EXISTS borrowed ("
+        "member_id TEXT NOT NULL, book_id TEXT NOT NULL, PRIMARY KEY (member_id, book_id))",
+    )
+    
+    def __init__(self, path, cache_size=10000, batch_size=1000):
+        """
+        Initialize a SQLiteBackend object.
+        
+        Args:
+            path: Path of the database file
+            cache_size: Number of books kept materialized in memory
+            batch_size: Number of rows written per transaction by put_books()
+        """
+        # Validate sizes
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("Cache size must be a non-negative integer")
+            
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer")
+            
+        # TODO: Open the connection and create the schema
+        # HINT: Import sqlite3 inside this method
+        # HINT: Connect with check_same_thread=False so a threaded server can use the backend; callers serialize access
+        # HINT: Run "PRAGMA journal_mode=WAL" and "PRAGMA synchronous=NORMAL" before creating the tables
+        # HINT: Create a BookCache(cache_size) in front of the database
+        pass
+    
+    def _row_to_book(self, row):
+        """
+        Build a Book object from a database row.
+        
+        Args:
+            row: Tuple of the books table columns
+            
+        Returns:
+            Book: Book, FictionBook or NonFictionBook depending on the kind column
+        """
+        # TODO: Create the class named by kind, passing extra as fiction_type or subject
+        pass
+    
+    def put_book(self, book):
+        """
+        Insert or replace a book.
+        
+        Args:
+            book: Book object to store
+        """
+        # TODO: Execute a parameterized INSERT OR REPLACE and commit
+        # HINT: Fill title_key and author_key with normalize_search_key() once, at write time
+        # HINT: Replace the book's book_words rows with one row per word of title_key ("title") and author_key ("author")
+        # HINT: Always use the same SQL string so sqlite3 reuses its cached prepared statement
+        # HINT: Call cache.discard(book.book_id) and then cache.put(book) so later reads return the stored object
+        pass
+    
+    def put_books(self, books):
+        """
+        Insert or replace many books in batched transactions.
+        
+        Args:
+            books: Iterable of Book objects to store
+            
+        Returns:
+            int: Number of books stored
+        """
+        # TODO: Use executemany() on chunks of batch_size rows, committing once per chunk
+        # HINT: Write the book_words rows of each chunk in the same transaction
+        # HINT: Update the cache like put_book() for every book in the chunk
+        pass
+    
+    def get_book(self, book_id):
+        """
+        Load a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            Book: Book object if found, None otherwise
+        """
+        # TODO: Return the cached book or load the row and add it to the cache
+        # HINT: Return the value of cache.put() so repeated calls get the same object
+        pass
+    
+    def delete_book(self, book_id):
+        """
+        Delete a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            bool: True if a book was deleted, False otherwise
+        """
+        # TODO: Delete the row and drop the cache entry
+        # HINT: Delete the book's book_words rows in the same transaction
+        pass
+    
+    def iter_books(self):
+        """
+        Iterate over all stored books.
+        
+        Yields:
+            Book: Each stored book
+        """
+        # TODO: Iterate over the cursor with fetchmany() instead of loading every row at once
+        # HINT: Yield cache.get() when the book is already materialized so identity is preserved
+        pass
+    
+    def iter_available_books(self):
+        """
+        Iterate over the stored books that are available.
+        
+        Yields:
+            Book: Each available book
+        """
+        # TODO: Iterate like iter_books() over "WHERE is_available = 1" so idx_books_available is used
+        pass
+    
+    def books_by_genre(self, genre):
+        """
+        Find books of a genre.
+        
+        Args:
+            genre: Genre to look for
+            
+        Returns:
+            list: Matching book IDs
+        """
+        # TODO: Select book IDs with "genre = ?" so idx_books_genre is used
+        pass
+    
+    def set_available(self, book_id, is_available):
+        """
+        Persist the availability of a book.
+        
+        Args:
+            book_id: ID of the book
+            is_available: New availability status
+        """
+        # TODO: Update the is_available column and commit
+        # HINT: Set is_available on the cached book, if any, so the cache matches the row
+        pass
+    
+    def set_available_many(self, book_ids, is_available):
+        """
+        Persist the availability of many books in one transaction.
+        
+        Args:
+            book_ids: IDs of the books
+            is_available: New availability status
+        """
+        # TODO: Use executemany() with the same UPDATE statement as set_available() and commit once
+        # HINT: Update the cached books like set_available()
+        pass
+    
+    def search_title(self, title):
+        """
+        Find books whose title contains every word of a string, ignoring case.
+        
+        Args:
+            title: Title to search for
+            
+        Returns:
+            list: Matching book IDs
+        """
+        # TODO: Normalize the query with normalize_search_key() and split it into words
+        # HINT: Look up each word with "field = 'title' AND word = ?" so the book_words primary key is used, and intersect the IDs
+        # HINT: For a query of several words, keep only candidates where "' ' || title_key || ' ' LIKE ? ESCAPE '!'" matches the whole phrase
+        # HINT: Prefix "!", "%" and "_" in the normalized query with "!" before wrapping it in "% " and " %"
+        # HINT: Return an empty list when the query has no words
+        pass
+    
+    def search_author(self, author):
+        """
+        Find books whose author contains every word of a string, ignoring case.
+        
+        Args:
+            author: Author to search for
+            
+        Returns:
+            list: Matching book IDs
+        """
+        # TODO: Normalize the query with normalize_search_key() and split it into words
+        # HINT: Look up each word with "field = 'author' AND word = ?" so the book_words primary key is used, and intersect the IDs
+        # HINT: For a query of several words, keep only candidates where "' ' || author_key || ' ' LIKE ? ESCAPE '!'" matches the whole phrase
+        # HINT: Prefix "!", "%" and "_" in the normalized query with "!" before wrapping it in "% " and " %"
+        # HINT: Return an empty list when the query has no words
+        pass
+    
+    def books_by_year(self, start_year, end_year):
+        """
+        Find books published in a range of years.
+        
+        Args:
+            start_year: First year of the range
+            end_year: Last year of the range
+            
+        Returns:
+            list: Matching book IDs
+        """
+        # TODO: Select book IDs with "publication_year BETWEEN ? AND ?" so idx_books_year is used
+        pass
+    
+    def put_member(self, member):
+        """
+        Insert or replace a member together with the books they borrowed.
+        
+        Args:
+            member: Member object to store
+        """
+        # TODO: Replace the members row and the member's borrowed rows in one transaction
+        # HINT: Store member.tier in the tier column so tier policies still apply after a reload
+        pass
+    
+    def get_member(self, member_id):
+        """
+        Load a member.
+        
+        Args:
+            member_id: ID of the member
+            
+        Returns:
+            Member: Member object if found, None otherwise
+        """
+        # TODO: Load the members row and the member's borrowed book IDs
+        # HINT: Pass the stored tier to the Member constructor
+        # HINT: Join borrowed with books to count the genre of every borrowed book and pass the counts as genre_counts
+        pass
+    
+    def iter_members(self):
+        """
+        Iterate over all stored members.
+        
+        Yields:
+            Member: Each stored member
+        """
+        # TODO: Yield every member, loading borrowed book IDs per member
+        # HINT: Pass the stored tier and the genre counts to the Member constructor like get_member()
+        pass
+    
+    def close(self):
+        """Commit pending work and close the connection."""
+        # TODO: Commit and close the connection
+        pass
+
+
+class LibraryEvent:
+    """Class representing one mutation of library state."""
+    
+    __slots__ = ("kind", "book_id", "member_id", "sequence", "timestamp", "book", "was_available")
+    
+    KINDS = ("book_added", "book_removed", "member_added", "book_checked_out", "book_returned")
+    
+    def __init__(self, kind, book_id=None, member_id=None, sequence=0, timestamp=None, book=None,
+                 was_available=None):
+        """
+        Initialize a LibraryEvent object.
+        
+        Args:
+            kind: One of KINDS
+            book_id: ID of the affected book, if any
+            member_id: ID of the affected member, if any
+            sequence: Position of the event in the library's event stream
+            timestamp: datetime of the event, or None for now
+            book: Affected Book object, since the library may no longer hold it when the event is applied
+            was_available: Availability of the book right after the event, or None if there is no book
+        """
+        # Validate kind
+        if kind not in self.KINDS:
+            raise ValueError("Unknown event kind")
+            
+        # TODO: Initialize all the slot attributes
+        pass
+
+
+class Subscription:
+    """Class holding one subscriber's bounded ring buffer of pending events."""
+    
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+    
+    def __init__(self, callback, kinds=None, capacity=1024, batch_size=64, overflow="drop_oldest"):
+        """
+        Initialize a Subscription object.
+        
+        Args:
+            callback: Function called with a list of LibraryEvent objects, or None for poll-only delivery
+            kinds: Event kinds to receive, or None for all kinds
+            capacity: Maximum number of pending events
+            batch_size: Maximum number of events per callback
+            overflow: What to do when the buffer is full, "drop_oldest" or "drop_newest"
+        """
+        # Validate sizes and overflow policy
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity must be a positive integer")
+            
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer")
+            
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError("Overflow policy must be 'drop_oldest' or 'drop_newest'")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Use collections.deque(maxlen=capacity) as the ring buffer for "drop_oldest"
+        # HINT: Keep a dropped counter and a threading.Event to wake the delivery thread
+        pass
+    
+    @property
+    def dropped(self):
+        """Get the number of events dropped because the buffer was full."""
+        # TODO: Return the dropped counter
+        pass
+    
+    def offer(self, event):
+        """
+        Queue an event without blocking.
+        
+        Args:
+            event: LibraryEvent object
+            
+        Returns:
+            bool: True if the event was queued, False if it was filtered out or dropped
+        """
+        # TODO: Skip events whose kind is not subscribed, apply the overflow policy and signal the delivery thread
+        pass
+    
+    def poll(self, max_events=None):
+        """
+        Take pending events.
+        
+        Args:
+            max_events: Maximum number of events to return, or None for batch_size
+            
+        Returns:
+            list: LibraryEvent objects in publication order
+        """
+        # TODO: Pop up to max_events events from the left of the ring buffer
+        pass
+    
+    def _deliver_loop(self):
+        """Call the callback with batches of events until the subscription is closed."""
+        # TODO: Wait on the event, then call the callback with poll() results until the buffer is empty
+        # HINT: Catch exceptions from the callback so one failing batch does not stop delivery
+        pass
+    
+    def close(self):
+        """Stop delivery and discard pending events."""
+        # TODO: Mark the subscription closed and wake the delivery thread
+        pass
+
+
+class EventBus:
+    """Class publishing library events to subscribers without blocking the publisher."""
+    
+    def __init__(self):
+        """Initialize an EventBus object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Keep a list of subscriptions and a sequence counter
+        pass
+    
+    def subscribe(self, callback=None, kinds=None, capacity=1024, batch_size=64, overflow="drop_oldest"):
+        """
+        Register a subscriber.
+        
+        Args:
+            callback: Function called with a list of LibraryEvent objects, or None for poll-only delivery
+            kinds: Event kinds to receive, or None for all kinds
+            capacity: Maximum number of pending events
+            batch_size: Maximum number of events per callback
+            overflow: What to do when the buffer is full, "drop_oldest" or "drop_newest"
+            
+        Returns:
+            Subscription: The new subscription
+        """
+        # TODO: Create the Subscription and start a daemon thread running _deliver_loop() when callback is given
+        # HINT: Replace the subscription list with a new list so publish() can iterate without a lock
+        pass
+    
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscriber.
+        
+        Args:
+            subscription: Subscription returned by subscribe()
+            
+        Returns:
+            bool: True if the subscription was removed, False otherwise
+        """
+        # TODO: Close the subscription and replace the subscription list without it
+        pass
+    
+    def publish(self, kind, book_id=None, member_id=None, book=None):
+        """
+        Publish an event to every subscriber.
+        
+        Args:
+            kind: One of LibraryEvent.KINDS
+            book_id: ID of the affected book, if any
+            member_id: ID of the affected member, if any
+            book: Affected Book object, if any
+            
+        Returns:
+            LibraryEvent: The published event, or None if there are no subscribers
+        """
+        # TODO: Return None immediately when there are no subscribers so the checkout path pays nothing
+        # HINT: Otherwise create one LibraryEvent with the next sequence number and offer() it to every subscription
+        # HINT: Copy book.is_available into was_available now; the book may change again before the event is applied
+        pass
+
+
+class TrieNode:
+    """Class representing an inner node of a PersistentMap trie."""
+    
+    __slots__ = ("bitmap", "children")
+    
+    def __init__(self, bitmap, children):
+        """
+        Initialize a TrieNode object.
+        
+        Args:
+            bitmap: Integer whose bit i is set when slot i holds a child
+            children: Tuple of the children of the set slots, in slot order
+        """
+        # TODO: Store bitmap and children; nodes are never changed after creation
+        pass
+
+
+class TrieLeaf:
+    """Class representing a stored pair of a PersistentMap trie."""
+    
+    __slots__ = ("key", "value")
+    
+    def __init__(self, key, value):
+        """
+        Initialize a TrieLeaf object.
+        
+        Args:
+            key: Stored key
+            value: Stored value
+        """
+        # TODO: Store key and value; leaves are never changed after creation
+        pass
+
+
+class PersistentMap:
+    """Class implementing an immutable hash array mapped trie; updates return a new map sharing structure."""
+    
+    BITS = 5  # Bits of the hash consumed per level, giving 32-way nodes
+    
+    def __init__(self, root=None, size=0):
+        """
+        Initialize a PersistentMap object.
+        
+        Args:
+            root: Root node of the trie, or None for an empty map
+            size: Number of keys stored under root
+        """
+        # TODO: Initialize all the private attributes
+        # HINT: Inner nodes are TrieNode objects and stored pairs are TrieLeaf objects
+        # HINT: A child is a TrieNode, a TrieLeaf, or a tuple of TrieLeaf objects for full hash collisions
+        # HINT: Tell children apart with isinstance() rather than by their length
+        pass
+    
+    def get(self, key, default=None):
+        """
+        Look up a key.
+        
+        Args:
+            key: Key to look up
+            default: Value returned when the key is missing
+            
+        Returns:
+            object: The value stored for key, or default
+        """
+        # TODO: Walk down using BITS bits of hash(key) per level
+        # HINT: The position of slot i in children is bin(node.bitmap & ((1 << i) - 1)).count("1")
+        pass
+    
+    def set(self, key, value):
+        """
+        Return a map with a key set.
+        
+        Args:
+            key: Key to set
+            value: Value to store
+            
+        Returns:
+            PersistentMap: New map; this map is unchanged
+        """
+        # TODO: Copy only the nodes on the path to key and reuse every other node
+        pass
+    
+    def delete(self, key):
+        """
+        Return a map without a key.
+        
+        Args:
+            key: Key to remove
+            
+        Returns:
+            PersistentMap: New map, or this map if key is missing
+        """
+        # TODO: Copy only the nodes on the path to key and collapse nodes left with a single leaf
+        pass
+    
+    def items(self):
+        """
+        Iterate over the stored pairs.
+        
+        Yields:
+            tuple: (key, value) pairs in trie order
+        """
+        # TODO: Traverse the trie depth first
+        pass
+    
+    def __contains__(self, key):
+        """
+        Check whether a key is stored.
+        
+        Args:
+            key: Key to look for
+            
+        Returns:
+            bool: True if key is stored, False otherwise
+        """
+        # TODO: Use get() with a private sentinel object as default
+        pass
+    
+    def __len__(self):
+        """
+        Get the number of stored keys.
+        
+        Returns:
+            int: Number of keys
+        """
+        # TODO: Return the stored size
+        pass
+
+
+class LibrarySnapshot:
+    """Class giving a consistent, read-only, point-in-time view of a library."""
+    
+    def __init__(self, books, members, availability, borrowed, storage=None):
+        """
+        Initialize a LibrarySnapshot object.
+        
+        Args:
+            books: PersistentMap of book_id to Book, or None when storage holds the books
+            members: PersistentMap of member_id to Member, or None when storage holds the members
+            availability: PersistentMap of book_id to availability status
+            borrowed: PersistentMap of member_id to a tuple of borrowed book IDs
+            storage: StorageBackend to load books and members from (optional); only IDs and
+                availability are frozen then, and rows deleted after the snapshot are skipped
+        """
+        # TODO: Store the maps and the storage backend; the maps never change, so no copying is needed
+        pass
+    
+    def get_book(self, book_id):
+        """
+        Get a book by ID.
+        
+        Args:
+            book_id: ID of the book to get
+            
+        Returns:
+            Book: Book object if it existed when the snapshot was taken, None otherwise
+        """
+        # TODO: Look up book_id in the books map
+        # HINT: Without a books map, load the book from storage only if book_id is in the availability map
+        # HINT: The row may have been deleted since the snapshot; return None then
+        return None
+    
+    def get_member(self, member_id):
+        """
+        Get a member by ID.
+        
+        Args:
+            member_id: ID of the member to get
+            
+        Returns:
+            Member: Member object if it existed when the snapshot was taken, None otherwise
+        """
+        # TODO: Look up member_id in the members map
+        # HINT: Without a members map, load the member from storage only if member_id is in the borrowed map
+        return None
+    
+    def is_available(self, book_id):
+        """
+        Get the availability of a book when the snapshot was taken.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            bool: Availability status, or None if the book did not exist
+        """
+        # TODO: Read the availability map rather than the live Book object
+        pass
+    
+    def books_borrowed(self, member_id):
+        """
+        Get the books a member had borrowed when the snapshot was taken.
+        
+        Args:
+            member_id: ID of the member
+            
+        Returns:
+            tuple: Borrowed book IDs
+        """
+        # TODO: Read the borrowed map, defaulting to an empty tuple
+        pass
+    
+    def iter_books(self):
+        """
+        Iterate over the books in the snapshot.
+        
+        Yields:
+            Book: Each book that existed when the snapshot was taken
+        """
+        # TODO: Yield the values of the books map
+        # HINT: Without a books map, load each key of the availability map from storage
+        # HINT: Skip keys whose row was deleted since the snapshot instead of yielding None
+        pass
+    
+    def iter_available_book_ids(self):
+        """
+        Iterate over the books that were available.
+        
+        Yields:
+            str: ID of each book available when the snapshot was taken
+        """
+        # TODO: Yield the keys of the availability map whose value is True
+        pass
+    
+    def book_count(self):
+        """
+        Get the number of books in the snapshot.
+        
+        Returns:
+            int: Number of books
+        """
+        # TODO: Return the size of the books map
+        # HINT: Without a books map, return the size of the availability map, which counts books deleted since
+        pass
+    
+    def member_count(self):
+        """
+        Get the number of members in the snapshot.
+        
+        Returns:
+            int: Number of members
+        """
+        # TODO: Return the size of the members map
+        # HINT: Without a members map, return the size of the borrowed map
+        pass
+
+
+class MaterializedView:
+    """Base class for a query result kept up to date from library events."""
+    
+    def rebuild(self, library):
+        """
+        Recompute the view from scratch.
+        
+        Args:
+            library: Library object to read
+        """
+        raise NotImplementedError("Subclasses must implement rebuild()")
+    
+    def apply(self, event, library):
+        """
+        Update the view for one event.
+        
+        Args:
+            event: LibraryEvent object
+            library: Library object the event came from
+        """
+        raise NotImplementedError("Subclasses must implement apply()")
+    
+    def result(self):
+        """
+        Get the current value of the view.
+        
+        Returns:
+            object: View-specific result, returned as a copy
+        """
+        raise NotImplementedError("Subclasses must implement result()")
+
+
+class CheckedOutByGenreView(MaterializedView):
+    """View counting checked out books per genre, inherits from MaterializedView."""
+    
+    def __init__(self):
+        """Initialize a CheckedOutByGenreView object."""
+        # TODO: Initialize the dictionary of counts per genre
+        pass
+    
+    def rebuild(self, library):
+        """
+        Recompute the view from scratch.
+        
+        Args:
+            library: Library object to read
+        """
+        # TODO: Count unavailable books per genre using library.iter_books()
+        pass
+    
+    def apply(self, event, library):
+        """
+        Update the view for one event.
+        
+        Args:
+            event: LibraryEvent object
+            library: Library object the event came from
+        """
+        # TODO: Add 1 to the book's genre on "book_checked_out" and subtract 1 on "book_returned"
+        # HINT: Add 1 on "book_added" when event.was_available is False, matching rebuild()
+        # HINT: Read the genre from event.book; the library may no longer hold the book when the view is read
+        # HINT: Only books on the shelf can be removed, so "book_removed" leaves the counts unchanged
+        pass
+    
+    def result(self):
+        """
+        Get the current value of the view.
+        
+        Returns:
+            dict: Dictionary mapping genres to checked out counts
+        """
+        # TODO: Return a copy of the counts without zero entries
+        pass
+
+
+class MembersAtLimitView(MaterializedView):
+    """View tracking members who reached their borrow limit, inherits from MaterializedView."""
+    
+    def __init__(self):
+        """Initialize a MembersAtLimitView object."""
+        # TODO: Initialize the set of member IDs at the limit
+        pass
+    
+    def rebuild(self, library):
+        """
+        Recompute the view from scratch.
+        
+        Args:
+            library: Library object to read
+        """
+        # TODO: Collect members using library.iter_members() for whom library.get_policy_engine().at_limit() is True
+        # HINT: Ask the engine instead of storing a number so tier limits are respected
+        pass
+    
+    def apply(self, event, library):
+        """
+        Update the view for one event.
+        
+        Args:
+            event: LibraryEvent object
+            library: Library object the event came from
+        """
+        # TODO: Re-check only event.member_id on checkout and return events with library.get_policy_engine().at_limit()
+        pass
+    
+    def result(self):
+        """
+        Get the current value of the view.
+        
+        Returns:
+            set: Member IDs at the borrow limit
+        """
+        # TODO: Return a copy of the set
+        pass
+
+
+class AvailabilityByDecadeView(MaterializedView):
+    """View counting available and total books per publication decade, inherits from MaterializedView."""
+    
+    def __init__(self):
+        """Initialize an AvailabilityByDecadeView object."""
+        # TODO: Initialize the dictionary mapping decades to [available, total] counts
+        pass
+    
+    def rebuild(self, library):
+        """
+        Recompute the view from scratch.
+        
+        Args:
+            library: Library object to read
+        """
+        # TODO: Count books per publication_year // 10 * 10 using library.iter_books()
+        pass
+    
+    def apply(self, event, library):
+        """
+        Update the view for one event.
+        
+        Args:
+            event: LibraryEvent object
+            library: Library object the event came from
+        """
+        # TODO: Add to total on "book_added", and to available only when event.was_available is True
+        # HINT: Move one book between states on checkout and return, and subtract from total and available on "book_removed"
+        # HINT: Read the year from event.book; the library may no longer hold the book when the view is read
+        pass
+    
+    def result(self):
+        """
+        Get the current value of the view.
+        
+        Returns:
+            dict: Dictionary mapping decades to (available, total) tuples
+        """
+        # TODO: Return the counts as tuples
+        pass
+
+
+class CatalogIndex(MaterializedView):
+    """View maintaining secondary indexes over title, author, genre, year and availability, inherits from MaterializedView."""
+    
+    def __init__(self):
+        """Initialize a CatalogIndex object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Map words of normalize_search_key(title) and normalize_search_key(author) to sets of book IDs
+        # HINT: Map each book_id to its (title key, author key) so phrases can be checked for adjacency
+        # HINT: Map normalize_search_key(genre) to sets of book IDs and keep a set of available book IDs
+        # HINT: Keep a list of (publication_year, book_id) tuples sorted with bisect.insort()
+        # HINT: Import bisect inside the methods that use it
+        pass
+    
+    def rebuild(self, library):
+        """
+        Recompute the indexes from scratch.
+        
+        Args:
+            library: Library object to read
+        """
+        # TODO: Clear every index and add each book from library.iter_books()
+        pass
+    
+    def apply(self, event, library):
+        """
+        Update the indexes for one event.
+        
+        Args:
+            event: LibraryEvent object
+            library: Library object the event came from
+        """
+        # TODO: Index event.book on "book_added" and move book IDs in or out of the available set on checkout and return
+        # HINT: Never call library.get_book(); the book may be removed or transferred before the view is read
+        # HINT: Add a new book to the available set only when event.was_available is True
+        # HINT: Drop event.book from every index on "book_removed"
+        pass
+    
+    def result(self):
+        """
+        Get the index itself for the query planner.
+        
+        Returns:
+            CatalogIndex: This index; it is read in place rather than copied
+        """
+        return self
+    
+    def lookup(self, field, op, value):
+        """
+        Get the book IDs matching one indexed predicate.
+        
+        Args:
+            field: One of "title", "author", "genre", "year" or "available"
+            op: Comparison operator, one of ":", ">", ">=", "<", "<="
+            value: Value to compare against
+            
+        Returns:
+            set: Matching book IDs
+        """
+        # TODO: Intersect word sets for title and author, read the genre or available sets, or bisect the year list
+        # HINT: For a value of several words, keep only candidates whose " " + key + " " contains " " + normalize_search_key(value) + " "
+        # HINT: Look up genres by normalize_search_key(value) so "fiction" finds books stored as "Fiction"
+        pass
+    
+    def estimate(self, field, op, value):
+        """
+        Estimate the number of books matching one indexed predicate without building the result.
+        
+        Args:
+            field: One of "title", "author", "genre", "year" or "available"
+            op: Comparison operator
+            value: Value to compare against
+            
+        Returns:
+            int: Estimated number of matches
+        """
+        # TODO: Use the smallest word set size for text fields, set sizes for genre and availability, and bisect positions for years
+        # HINT: Normalize genre values the same way as lookup()
+        pass
+
+
+# DO NOT MODIFY THESE CLASS VARIABLES
+class Library:
+    """Class representing a library system."""
+    
+    book_count = 0  # Class variable to track total books
+    member_count = 0  # Class variable to track total members
+    
+    def __init__(self, name, address, storage=None):
+        """
+        Initialize a Library object.
+        
+        Args:
+            name: Name of the library
+            address: Address of the library
+            storage: StorageBackend object holding books and members, or None to keep them in memory
+        """
+        # Validate storage
+        if storage is not None and not isinstance(storage, StorageBackend):
+            raise ValueError("Storage must be a StorageBackend")
+            
+        # TODO: Initialize all attributes
+        # HINT: Create dictionaries to store books and members
+        # HINT: Keep the storage backend; when it is set, the dictionaries are not used
+        # HINT: Create a LoanTracker to record checkouts
+        # HINT: Create a HoldRegistry for hold queues
+        # HINT: Create a PolicyEngine with a MaxBooksPolicy(Member.MAX_BOOKS)
+        # HINT: Create a dictionary mapping each checked out book_id to the member_id holding it
+        # HINT: Create a CounterRegistry for the counters of this library instance
+        # HINT: Initialize the attached LibraryNetwork to None
+        # HINT: Initialize the shared availability bitmap and its slot dictionary to None
+        # HINT: Create an EventBus for mutation events
+        # HINT: Create a dictionary of registered views by name, each paired with its poll-only Subscription
+        # HINT: Create empty PersistentMap objects for books, members, availability and borrowed book IDs
+        # HINT: When a storage backend is set, keep only the availability and borrowed maps, which hold IDs, and set books and members to None
+        # HINT: Create a dictionary mapping book_id to its (title key, author key) from normalize_search_key()
+        # HINT: Leave it empty when a storage backend is set; the backend stores the keys and answers searches
+        pass
+    
+    @property
+    def events(self):
+        """Get the event bus of the library."""
+        # TODO: Return the EventBus
+        pass
+    
+    @property
+    def name(self):
+        """Get the library name."""
+        # TODO: Return the name
+        pass
+    
+    @property
+    def address(self):
+        """Get the library address."""
+        # TODO: Return the address
+        pass
+    
+    @staticmethod
+    def get_book_count():
+        """
+        Get the total number of books.
+        
+        Returns:
+            int: Total number of books
+        """
+        # TODO: Return the book_count class variable
+        pass
+    
+    @staticmethod
+    def get_member_count():
+        """
+        Get the total number of members.
+        
+        Returns:
+            int: Total number of members
+        """
+        # TODO: Return the member_count class variable
+        pass
+    
+    def get_branch_book_count(self):
+        """
+        Get the number of books added to this library instance.
+        
+        Returns:
+            int: Number of books in this library
+        """
+        # TODO: Return the value of the "books" counter of this instance
+        pass
+    
+    def get_branch_member_count(self):
+        """
+        Get the number of members added to this library instance.
+        
+        Returns:
+            int: Number of members in this library
+        """
+        # TODO: Return the value of the "members" counter of this instance
+        pass
+    
+    @staticmethod
+    def get_global_counters():
+        """
+        Get the counters aggregated across every library instance.
+        
+        Returns:
+            dict: Dictionary mapping counter names to totals
+        """
+        # TODO: Return global_counters.snapshot()
+        pass
+    
+    def set_policy_engine(self, engine):
+        """
+        Replace the borrow policies of this library branch.
+        
+        Args:
+            engine: PolicyEngine object to use for checkouts
+        """
+        # Validate engine
+        if not isinstance(engine, PolicyEngine):
+            raise ValueError("Engine must be a PolicyEngine")
+            
+        # TODO: Store the engine
+        pass
+    
+    def get_policy_engine(self):
+        """
+        Get the borrow policies of this library branch.
+        
+        Returns:
+            PolicyEngine: Engine used for checkouts
+        """
+        # TODO: Return the stored engine
+        pass
+    
+    def add_book(self, book, transfer=False):
+        """
+        Add a book to the library.
+        
+        Args:
+            book: Book object to add
+            transfer: True when the book arrives from another branch (default False)
+            
+        Returns:
+            bool: True if addition successful, False otherwise
+        """
+        # TODO: Implement add book logic
+        # HINT: Check if book already exists before adding
+        # HINT: Store the normalized title and author keys of the book, in memory mode only
+        # HINT: When a storage backend is set, use storage.put_book() instead of the dictionary
+        # HINT: Increment book_count class variable
+        # HINT: Increment the "books" counter of this instance and of global_counters
+        # HINT: When transfer is True, only increment the counter of this instance; the book already exists in the system
+        # HINT: Call network.index_book() when a network is attached
+        # HINT: Publish a "book_added" event, passing the Book as book=
+        # HINT: Replace the books and availability PersistentMap objects with the updated ones
+        pass
+    
+    def load_books(self, books):
+        """
+        Add many books to the library in one call.
+        
+        Args:
+            books: Iterable of Book objects
+            
+        Returns:
+            int: Number of books added
+        """
+        # TODO: Implement bulk load logic
+        # HINT: Skip books whose ID already exists and increment book_count once by the number added
+        # HINT: Store the normalized title and author keys of every added book, in memory mode only
+        # HINT: When a storage backend is set, write the new books with one storage.put_books() call
+        # HINT: Increment the "books" counters once by the number added
+        # HINT: Publish a "book_added" event for every added book, passing the Book as book=
+        # HINT: Replace the books and availability PersistentMap objects with the updated ones
+        pass
+    
+    def filter_books_by_genre(self, genre):
+        """
+        Get books of a genre using integer code comparison.
+        
+        Args:
+            genre: Genre to filter by
+            
+        Returns:
+            dict: Dictionary of matching books
+        """
+        # Check for None
+        if genre is None:
+            raise ValueError("Genre cannot be None")
+            
+        # TODO: Return a dictionary of books whose genre_code equals the code of genre
+        # HINT: Use Book.genre_pool.lookup_code() and return an empty dictionary when the genre is unknown
+        # HINT: When a storage backend is set, load the IDs from storage.books_by_genre()
+        pass
+    
+    def add_member(self, member):
+        """
+        Add a member to the library.
+        
+        Args:
+            member: Member object to add
+            
+        Returns:
+            bool: True if addition successful, False otherwise
+        """
+        # TODO: Implement add member logic
+        # HINT: Check if member already exists before adding
+        # HINT: When a storage backend is set, use storage.put_member() instead of the dictionary
+        # HINT: Increment member_count class variable
+        # HINT: Increment the "members" counter of this instance and of global_counters
+        # HINT: Publish a "member_added" event
+        # HINT: Replace the members and borrowed PersistentMap objects with the updated ones
+        pass
+    
+    def add_copies(self, book, copies):
+        """
+        Add a title with several physical copies to the library.
+        
+        Args:
+            book: Book object holding the shared bibliographic record
+            copies: Number of physical copies
+            
+        Returns:
+            bool: True if addition successful, False if the title is held as a single book or copies are unsupported
+        """
+        # TODO: Implement add copies logic
+        # HINT: Return False when a storage backend or shared availability is set; inventories live in this process only
+        # HINT: Return False when book_id is already held as a single book without a CopyInventory
+        # HINT: For a new title, call add_book(book) so get_book(), searches, iter_books() and views see the title once
+        # HINT: Then store one CopyInventory per book_id instead of one Book per copy
+        # HINT: Add copies to the existing CopyInventory when the title is already known
+        # HINT: Views count titles, so adding copies to a known title publishes nothing unless it comes back on the shelf
+        pass
+    
+    def get_copy_inventory(self, book_id):
+        """
+        Get the copy inventory of a title.
+        
+        Args:
+            book_id: ID of the title
+            
+        Returns:
+            CopyInventory: CopyInventory object if found, None otherwise
+        """
+        # TODO: Return the CopyInventory for book_id or None if not found
+        return None
+    
+    def checkout_book(self, book_id, member_id):
+        """
+        Check out a book to a member.
+        
+        Args:
+            book_id: ID of the book to check out
+            member_id: ID of the member checking out the book
+            
+        Returns:
+            bool: True if checkout successful, False otherwise
+        """
+        # TODO: Implement checkout logic
+        # HINT: Check if book and member exist
+        # HINT: Pass the PolicyEngine to member.borrow_book(book, policy) so the configured limits apply
+        # HINT: When a storage backend is set, persist with storage.set_available() and storage.put_member()
+        # HINT: In multiprocess mode, call bitmap.try_checkout() first and bitmap.release() if the borrow then fails
+        # HINT: Use member.borrow_book() method
+        # HINT: Open a loan in the LoanTracker when the borrow succeeds
+        # HINT: Record book_id -> member_id in the borrower index when the borrow succeeds
+        # HINT: Call network.update_availability() when a network is attached
+        # HINT: Publish a "book_checked_out" event, passing the Book as book=
+        # HINT: Replace the availability and borrowed PersistentMap objects with the updated ones
+        # HINT: For multi-copy titles, call member.borrow_copy(inventory, policy) instead of member.borrow_book()
+        # HINT: Key the loan and the borrower index entry by the returned copy ID, not by book_id
+        # HINT: Publish "book_checked_out" for book_id only when the last free copy was taken, so views stay keyed by title
+        pass
+    
+    def return_book(self, book_id, member_id):
+        """
+        Return a book to the library.
+        
+        Args:
+            book_id: ID of the book to return
+            member_id: ID of the member returning the book
+            
+        Returns:
+            bool: True if return successful, False otherwise
+        """
+        # TODO: Implement return logic
+        # HINT: Check if book and member exist
+        # HINT: Use member.return_book() method
+        # HINT: Close the loan in the LoanTracker when the return succeeds
+        # HINT: When a storage backend is set, persist with storage.set_available() and storage.put_member()
+        # HINT: Remove book_id from the borrower index when the return succeeds
+        # HINT: In multiprocess mode, call bitmap.release() when the return succeeds
+        # HINT: Call network.update_availability() when a network is attached
+        # HINT: Publish a "book_returned" event, passing the Book as book=
+        # HINT: Replace the availability and borrowed PersistentMap objects with the updated ones
+        # HINT: For copy IDs, split on CopyInventory.COPY_SEPARATOR and call member.return_copy(inventory, copy_id)
+        # HINT: Close the loan and the borrower index entry of the copy ID, then hand the title to the next hold on book_id
+        # HINT: Publish "book_returned" for book_id only when the title was out of copies before this return
+        # HINT: Hand the book to the first waiting member with next_member() and checkout_book()
+        # HINT: Keep taking the next member while a handoff fails (e.g. the member is at the borrow limit)
+        pass
+    
+    def checkout_books(self, member_id, book_ids):
+        """
+        Check out several books to a member in one pass.
+        
+        Args:
+            member_id: ID of the member checking out the books
+            book_ids: List of IDs of the books to check out
+            
+        Returns:
+            bool: True if every book was checked out, False if none were
+        """
+        # Check for None
+        if book_ids is None:
+            raise ValueError("Book IDs cannot be None")
+            
+        # TODO: Implement batch checkout logic
+        # HINT: Look up the member once and resolve every book ID before changing any state
+        # HINT: Return False if the member or any book does not exist
+        # HINT: Return False if any book ID has a CopyInventory; multi-copy titles go through checkout_book()
+        # HINT: Use member.borrow_books(books, policy) with the PolicyEngine and open one loan per book when it succeeds
+        # HINT: Update the borrower index for every book in the batch
+        # HINT: Publish one "book_checked_out" event per book after the batch succeeds, passing the Book as book=
+        # HINT: When a storage backend is set, read the books with storage.get_book() and persist with one storage.set_available_many() call
+        # HINT: Replace the availability and borrowed PersistentMap objects once for the whole batch
+        pass
+    
+    def return_books(self, member_id, book_ids):
+        """
+        Return several books from a member in one pass.
+        
+        Args:
+            member_id: ID of the member returning the books
+            book_ids: List of IDs of the books to return
+            
+        Returns:
+            bool: True if every book was returned, False if none were
+        """
+        # Check for None
+        if book_ids is None:
+            raise ValueError("Book IDs cannot be None")
+            
+        # TODO: Implement batch return logic
+        # HINT: Resolve the member and every book first, then use member.return_books()
+        # HINT: Return False if any ID is a copy ID or has a CopyInventory; copies go through return_book()
+        # HINT: Update the borrower index for every book in the batch
+        # HINT: Close the loans and process hold handoffs after the whole batch has been returned
+        # HINT: Publish one "book_returned" event per book after the batch succeeds, passing the Book as book=
+        # HINT: When a storage backend is set, read the books with storage.get_book() and persist with one storage.set_available_many() call
+        # HINT: Replace the availability and borrowed PersistentMap objects once for the whole batch
+        pass
+    
+    def who_has(self, book_id):
+        """
+        Get the member currently holding a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            str: Member ID if the book is checked out, None otherwise
+        """
+        # TODO: Return the borrower index entry for book_id or None if not found
+        return None
+    
+    def return_book_by_id(self, book_id):
+        """
+        Return a book without knowing which member has it.
+        
+        Args:
+            book_id: ID of the book to return
+            
+        Returns:
+            bool: True if return successful, False otherwise
+        """
+        # TODO: Look up the member with who_has() and delegate to return_book()
+        pass
+    
+    def check_consistency(self):
+        """
+        Compare the borrower index with the members' borrowed books.
+        
+        Returns:
+            list: Descriptions of every inconsistency found, empty if consistent
+        """
+        # TODO: Report index entries whose member does not list the book
+        # HINT: Also report books listed by a member but missing from the index or mapped to another member
+        # HINT: Also report checked out books that are available, and unavailable books that nobody holds
+        pass
+    
+    def rebuild_borrower_index(self):
+        """
+        Rebuild the borrower index from the members' borrowed books.
+        
+        Returns:
+            int: Number of entries in the rebuilt index
+        """
+        # TODO: Replace the borrower index with one built from every member.books_borrowed
+        pass
+    
+    def place_hold(self, book_id, member_id):
+        """
+        Place a hold on a book that is currently checked out.
+        
+        Args:
+            book_id: ID of the book to hold
+            member_id: ID of the member placing the hold
+            
+        Returns:
+            bool: True if the hold was placed, False otherwise
+        """
+        # TODO: Implement place hold logic
+        # HINT: Check if book and member exist
+        # HINT: Only place a hold when the book is not available
+        # HINT: Holds on multi-copy titles use the title book_id and are filled by whichever copy comes back first
+        pass
+    
+    def cancel_hold(self, book_id, member_id):
+        """
+        Cancel a hold on a book.
+        
+        Args:
+            book_id: ID of the held book
+            member_id: ID of the member cancelling the hold
+            
+        Returns:
+            bool: True if the hold was cancelled, False otherwise
+        """
+        # TODO: Delegate to the HoldRegistry
+        pass
+    
+    def get_overdue_loans(self, now=None):
+        """
+        Get all overdue loans.
+        
+        Args:
+            now: datetime to compare against, or None for now
+            
+        Returns:
+            list: Overdue Loan objects sorted by due date
+        """
+        # TODO: Return the overdue loans from the LoanTracker
+        pass
+    
+    def get_loans_due_within(self, hours=1, now=None):
+        """
+        Get loans that are not yet overdue but come due within a number of hours.
+        
+        Args:
+            hours: Size of the look-ahead window in hours
+            now: datetime the window starts at, or None for now
+            
+        Returns:
+            list: Loan objects due after now and on or before now + hours, sorted by due date
+        """
+        # TODO: Return the loans due within the window from the LoanTracker
+        pass
+    
+    def get_available_books(self):
+        """
+        Get all available books.
+        
+        Returns:
+            dict: Dictionary of available books
+        """
+        # TODO: Return a dictionary of all available books
+        # HINT: Use dictionary comprehension
+        # HINT: When a storage backend is set, build it from storage.iter_available_books()
+        # HINT: In multiprocess mode, filter with is_book_available() instead of the local is_available flags
+        pass
+    
+    def is_book_available(self, book_id):
+        """
+        Get the current availability of a book.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            bool: True if the book is on the shelf, False otherwise or if it is not found
+        """
+        # TODO: Return the is_available flag of the book
+        # HINT: In multiprocess mode, read bitmap.is_available(slots[book_id]) so checkouts by other processes are seen
+        # HINT: Copy the shared bit into the local Book through its is_available setter so returned objects agree
+        pass
+    
+    def search_book_by_title(self, title):
+        """
+        Search for books by title.
+        
+        Args:
+            title: Title to search for
+            
+        Returns:
+            dict: Dictionary of matching books
+        """
+        # Check for None
+        if title is None:
+            raise ValueError("Search title cannot be None")
+            
+        # TODO: Return a dictionary of books with matching titles
+        # HINT: Use dictionary comprehension and case-insensitive search
+        # HINT: Normalize the query once with normalize_search_key() and compare it with the stored title keys
+        # HINT: When a storage backend is set, load the IDs from storage.search_title()
+        pass
+    
+    def search_book_by_author(self, author):
+        """
+        Search for books by author.
+        
+        Args:
+            author: Author to search for
+            
+        Returns:
+            dict: Dictionary of matching books
+        """
+        # Check for None
+        if author is None:
+            raise ValueError("Search author cannot be None")
+            
+        # TODO: Return a dictionary of books with matching authors
+        # HINT: Use the partial word matching for author search
+        # HINT: Normalize the query once with normalize_search_key() and compare it with the stored author keys
+        # HINT: When a storage backend is set, load the IDs from storage.search_author()
+        pass
+    
+    def remove_book(self, book_id, transfer=False):
+        """
+        Remove a book from the library.
+        
+        Args:
+            book_id: ID of the book to remove
+            transfer: True when the book leaves for another branch (default False)
+            
+        Returns:
+            Book: The removed Book object if found and available, None otherwise
+        """
+        # TODO: Implement remove book logic
+        # HINT: Only books that are on the shelf can be removed
+        # HINT: For a multi-copy title, only remove it when every copy is on the shelf, and drop its CopyInventory too
+        # HINT: When a storage backend is set, use storage.get_book() and storage.delete_book() instead of the dictionary
+        # HINT: Remove the normalized keys of the book, in memory mode only
+        # HINT: Decrement the "books" counter of this instance and notify the attached network
+        # HINT: Publish a "book_removed" event carrying the removed Book
+        # HINT: Unless transfer is True, also decrement book_count and the "books" counter of global_counters
+        # HINT: Both count books held by every branch; global_counters["books"] is authoritative and book_count mirrors it
+        # HINT: Replace the books and availability PersistentMap objects with the updated ones
+        pass
+    
+    def enable_shared_availability(self, bitmap, slots):
+        """
+        Switch checkouts to multiprocess mode backed by a shared bitmap.
+        
+        Args:
+            bitmap: SharedAvailabilityBitmap object shared with other processes
+            slots: Dictionary mapping book IDs to bit indexes in the bitmap
+        """
+        # Check for None
+        if bitmap is None or slots is None:
+            raise ValueError("Bitmap and slots cannot be None")
+            
+        # TODO: Store the bitmap and the slots
+        # HINT: Raise ValueError if the library already holds multi-copy titles; one bit cannot track several copies
+        pass
+    
+    def attach_network(self, network):
+        """
+        Attach the library to a LibraryNetwork.
+        
+        Args:
+            network: LibraryNetwork object to notify, or None to detach
+        """
+        # TODO: Store the network
+        pass
+    
+    def register_view(self, name, view, capacity=65536):
+        """
+        Register a materialized view kept up to date from this library's events.
+        
+        Args:
+            name: Name of the view
+            view: MaterializedView object
+            capacity: Maximum number of events buffered between two reads of the view
+            
+        Returns:
+            bool: True if registration successful, False if the name is taken
+        """
+        # Validate view
+        if not isinstance(view, MaterializedView):
+            raise ValueError("View must be a MaterializedView")
+            
+        # TODO: Subscribe to the event bus without a callback, then call view.rebuild(self)
+        # HINT: The rebuild already reflects every event buffered so far, so discard them with subscription.poll() afterwards
+        # HINT: Remember subscription.dropped as the baseline for later overflow checks
+        pass
+    
+    def get_view(self, name):
+        """
+        Get the current result of a materialized view.
+        
+        Args:
+            name: Name of the view
+            
+        Returns:
+            object: Result of the view if registered, None otherwise
+        """
+        # TODO: Apply the pending events from the view's subscription, then return view.result()
+        # HINT: If subscription.dropped grew since the last read, rebuild the view instead of applying events
+        # HINT: After that rebuild, discard the buffered events with subscription.poll() and store the new dropped baseline
+        pass
+    
+    def unregister_view(self, name):
+        """
+        Remove a materialized view.
+        
+        Args:
+            name: Name of the view
+            
+        Returns:
+            bool: True if the view was removed, False otherwise
+        """
+        # TODO: Unsubscribe the view from the event bus and forget it
+        pass
+    
+    def get_book(self, book_id):
+        """
+        Get a book by ID.
+        
+        Args:
+            book_id: ID of the book to get
+            
+        Returns:
+            Book: Book object if found, None otherwise
+        """
+        # TODO: Return the book with the given ID or None if not found
+        # HINT: When a storage backend is set, use storage.get_book()
+        # HINT: In multiprocess mode, call is_book_available() first so the returned flag matches the shared bitmap
+        return None
+    
+    def get_member(self, member_id):
+        """
+        Get a member by ID.
+        
+        Args:
+            member_id: ID of the member to get
+            
+        Returns:
+            Member: Member object if found, None otherwise
+        """
+        # TODO: Return the member with the given ID or None if not found
+        # HINT: When a storage backend is set, use storage.get_member()
+        return None
+    
+    def snapshot(self):
+        """
+        Take a consistent point-in-time view of the library in O(1).
+        
+        Returns:
+            LibrarySnapshot: Read-only view unaffected by later changes
+        """
+        # TODO: Wrap the current PersistentMap objects in a LibrarySnapshot
+        # HINT: When a storage backend is set, pass None for books and members together with the backend
+        # HINT: Writers replace the maps instead of changing them, so nothing needs to be copied
+        pass
+    
+    def get_all_books(self):
+        """
+        Get all books.
+        
+        Returns:
+            dict: Dictionary of all books
+        """
+        # TODO: Return a copy of the books dictionary
+        # HINT: When a storage backend is set, build it from storage.iter_books()
         pass
     
     def get_all_members(self):
         """
-        Get all members.
+        Get all members.
+        
+        Returns:
+            dict: Dictionary of all members
+        """
+        # TODO: Return a copy of the members dictionary
+        # HINT: When a storage backend is set, build it from storage.iter_members()
+        pass
+    
+    def iter_books(self):
+        """
+        Iterate over all books without copying the books dictionary.
+        
+        Yields:
+            Book: Each book stored in the library
+        """
+        # TODO: Yield every Book object stored in the library
+        # HINT: Use yield from over the values of the books dictionary
+        # HINT: When a storage backend is set, use yield from storage.iter_books()
+        pass
+    
+    def render_books(self, book_ids=None, separator="\n"):
+        """
+        Render many books in one pass.
+        
+        Args:
+            book_ids: IDs of the books to render, or None for all books
+            separator: String placed between rendered books
+            
+        Returns:
+            str: Rendered books joined by the separator
+        """
+        # Validate separator
+        if not isinstance(separator, str):
+            raise ValueError("Separator must be a string")
+            
+        # TODO: Join the display_info() of every requested book
+        # HINT: Use separator.join() over a generator instead of concatenating in a loop
+        # HINT: Skip book IDs that are not in the library
+        pass
+    
+    def iter_members(self):
+        """
+        Iterate over all members without copying the members dictionary.
+        
+        Yields:
+            Member: Each member registered with the library
+        """
+        # TODO: Yield every Member object registered with the library
+        # HINT: Use yield from over the values of the members dictionary
+        # HINT: When a storage backend is set, use yield from storage.iter_members()
+        pass
+
+
+class CatalogExporter:
+    """Class that streams library books and members to CSV or JSONL files."""
+    
+    FORMATS = ("csv", "jsonl")
+    BOOK_FIELDS = ("book_id", "title", "author", "genre", "publication_year", "is_available")
+    MEMBER_FIELDS = ("member_id", "name", "email", "books_borrowed")
+    
+    def __init__(self, library, buffer_size=1024 * 1024):
+        """
+        Initialize a CatalogExporter object.
+        
+        Args:
+            library: Library object whose books and members are exported
+            buffer_size: Size in bytes of the output file buffer
+        """
+        # Validate library and buffer_size
+        if library is None:
+            raise ValueError("Library cannot be None")
+        
+        if not isinstance(buffer_size, int) or buffer_size <= 0:
+            raise ValueError("Buffer size must be a positive integer")
+        
+        # TODO: Initialize all the private attributes
+        pass
+    
+    def _open(self, path, compress):
+        """
+        Open a buffered text handle for writing.
+        
+        Args:
+            path: Path of the output file
+            compress: Whether the output should be gzip compressed
+        
+        Returns:
+            file: Writable text file handle
+        """
+        # TODO: Open the output file with the configured buffer size
+        # HINT: Import gzip inside this method and use gzip.open(path, "wt") when compress is True
+        # HINT: Otherwise use open(path, "w", buffering=buffer_size, newline="")
+        pass
+    
+    def export_books(self, path, fmt="csv", compress=False):
+        """
+        Stream all books of the library to a file.
+        
+        Args:
+            path: Path of the output file
+            fmt: Output format, either "csv" or "jsonl"
+            compress: Whether the output should be gzip compressed
+        
+        Returns:
+            int: Number of rows written
+        """
+        # Validate format
+        if fmt not in self.FORMATS:
+            raise ValueError("Export format must be 'csv' or 'jsonl'")
+        
+        # TODO: Write one row per book read from library.iter_books()
+        # HINT: Build each row from the book properties in BOOK_FIELDS order, not from display_info()
+        # HINT: Use csv.writer(...).writerow() or json.dumps() per row and write directly to the handle
+        pass
+    
+    def export_members(self, path, fmt="csv", compress=False):
+        """
+        Stream all members of the library to a file.
+        
+        Args:
+            path: Path of the output file
+            fmt: Output format, either "csv" or "jsonl"
+            compress: Whether the output should be gzip compressed
+        
+        Returns:
+            int: Number of rows written
+        """
+        # Validate format
+        if fmt not in self.FORMATS:
+            raise ValueError("Export format must be 'csv' or 'jsonl'")
+        
+        # TODO: Write one row per member read from library.iter_members()
+        # HINT: Join books_borrowed with ";" for CSV rows and keep it as a list for JSONL rows
+        pass
+    
+    def measure_throughput(self, path, fmt="csv", compress=False):
+        """
+        Measure book export throughput.
+        
+        Args:
+            path: Path of the output file
+            fmt: Output format, either "csv" or "jsonl"
+            compress: Whether the output should be gzip compressed
+        
+        Returns:
+            float: Rows written per second
+        """
+        # TODO: Time a call to export_books() and return rows per second
+        # HINT: Import time inside this method and use time.perf_counter()
+        # HINT: Return 0.0 when no rows were written
+        pass
+
+
+class LibraryNetwork:
+    """Class federating many library branches behind one shared catalog index."""
+    
+    def __init__(self):
+        """Initialize a LibraryNetwork object."""
+        # TODO: Initialize all the private attributes
+        # HINT: Create a dictionary of branches by library name
+        # HINT: Create a dictionary mapping book_id to the set of branch names holding the book
+        # HINT: Create a dictionary mapping book_id to the set of branch names where it is available
+        # HINT: Create dictionaries mapping words of normalize_search_key(title) and normalize_search_key(author) to sets of book IDs
+        pass
+    
+    def add_branch(self, library):
+        """
+        Add a library branch to the network.
+        
+        Args:
+            library: Library object to add
+            
+        Returns:
+            bool: True if addition successful, False if a branch with that name exists
+        """
+        # Check for None
+        if library is None:
+            raise ValueError("Library cannot be None")
+            
+        # TODO: Store the branch, call library.attach_network(self) and index its books
+        # HINT: Use library.iter_books() and index_book() for every book
+        pass
+    
+    def remove_branch(self, name):
+        """
+        Remove a library branch from the network.
+        
+        Args:
+            name: Name of the branch
+            
+        Returns:
+            Library: The removed Library object if found, None otherwise
+        """
+        # TODO: Detach the branch and drop its entries from every index
+        pass
+    
+    def get_branch(self, name):
+        """
+        Get a branch by name.
+        
+        Args:
+            name: Name of the branch
+            
+        Returns:
+            Library: Library object if found, None otherwise
+        """
+        # TODO: Return the branch with the given name or None if not found
+        return None
+    
+    def index_book(self, branch_name, book):
+        """
+        Add a book of a branch to the shared index.
+        
+        Args:
+            branch_name: Name of the branch holding the book
+            book: Book object to index
+        """
+        # TODO: Record the branch in the holdings, availability and word indexes
+        pass
+    
+    def unindex_book(self, branch_name, book_id):
+        """
+        Remove a book of a branch from the shared index.
+        
+        Args:
+            branch_name: Name of the branch that held the book
+            book_id: ID of the book
+        """
+        # TODO: Remove the branch from the holdings and availability sets of book_id
+        # HINT: Drop word index entries only when no branch holds the book anymore
+        pass
+    
+    def update_availability(self, branch_name, book_id, is_available):
+        """
+        Record an availability change reported by a branch.
+        
+        Args:
+            branch_name: Name of the branch
+            book_id: ID of the book
+            is_available: New availability of the book at that branch
+        """
+        # TODO: Add or remove branch_name in the availability set of book_id
+        pass
+    
+    def find_available(self, book_id):
+        """
+        Get the branches where a book can be checked out.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            list: Sorted names of branches where the book is available
+        """
+        # TODO: Answer from the availability index without querying any branch
+        pass
+    
+    def search_book_by_title(self, title):
+        """
+        Search the merged catalog by title.
+        
+        Args:
+            title: Title to search for
+            
+        Returns:
+            dict: Dictionary mapping matching book IDs to lists of branch names
+        """
+        # Check for None
+        if title is None:
+            raise ValueError("Search title cannot be None")
+            
+        # TODO: Intersect the title word index sets for every word of normalize_search_key(title)
+        pass
+    
+    def search_book_by_author(self, author):
+        """
+        Search the merged catalog by author.
+        
+        Args:
+            author: Author to search for
+            
+        Returns:
+            dict: Dictionary mapping matching book IDs to lists of branch names
+        """
+        # Check for None
+        if author is None:
+            raise ValueError("Search author cannot be None")
+            
+        # TODO: Intersect the author word index sets for every word of normalize_search_key(author)
+        pass
+    
+    def transfer_book(self, book_id, source_name, target_name):
+        """
+        Move a book from one branch to another.
+        
+        Args:
+            book_id: ID of the book to move
+            source_name: Name of the branch giving the book
+            target_name: Name of the branch receiving the book
+            
+        Returns:
+            bool: True if transfer successful, False otherwise
+        """
+        # TODO: Implement transfer logic
+        # HINT: Check both branches exist and the target does not already hold book_id
+        # HINT: Return False for titles with source.get_copy_inventory(book_id); copies are not transferred
+        # HINT: Use source.remove_book() then target.add_book(), and add it back to the source if that fails
+        # HINT: Pass transfer=True to every call so Library.book_count and global_counters["books"] stay unchanged
+        pass
+
+
+QUERY_FIELDS = {
+    "title": True,
+    "author": True,
+    "genre": True,
+    "year": True,
+    "available": True,
+    "fiction_type": False,
+    "subject": False,
+}  # Query fields mapped to whether CatalogIndex can answer them
+
+
+def parse_query(text):
+    """
+    Parse a catalog query such as: author:tolkien AND year:>1950 AND NOT genre:poetry
+    
+    Args:
+        text: Query text; terms are field:value, field:>value, field:>=value, field:<value, field:<=value
+              or field:"quoted phrase", combined with AND, OR, NOT and parentheses
+        
+    Returns:
+        tuple: Syntax tree of ("and", [nodes]), ("or", [nodes]), ("not", node) and ("term", field, op, value) nodes
+    """
+    # Check for None
+    if text is None:
+        raise ValueError("Query cannot be None")
+        
+    # TODO: Implement a recursive descent parser
+    # HINT: Tokenize with a regular expression into parentheses, AND/OR/NOT keywords and field terms
+    # HINT: NOT binds tighter than AND, AND binds tighter than OR, and adjacent terms mean AND
+    # HINT: Convert year values to int and available values ("true"/"false") to bool
+    # HINT: Raise ValueError for unknown fields (not in QUERY_FIELDS), unbalanced parentheses or empty queries
+    pass
+
+
+class QueryPlanner:
+    """Class compiling catalog queries into index intersections over a Library."""
+    
+    INDEX_VIEW_NAME = "catalog_index"
+    
+    def __init__(self, library):
+        """
+        Initialize a QueryPlanner object.
+        
+        Args:
+            library: Library object to query
+        """
+        # Check for None
+        if library is None:
+            raise ValueError("Library cannot be None")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Register a CatalogIndex with library.register_view() unless one is already registered
+        pass
+    
+    def plan(self, query):
+        """
+        Build an execution plan for a query.
+        
+        Args:
+            query: Query text or a syntax tree from parse_query()
+            
+        Returns:
+            tuple: Plan tree with a cost estimate on every node
+        """
+        # TODO: Parse text queries, then plan each node bottom-up
+        # HINT: For "and", order indexed children by CatalogIndex.estimate() so the most selective runs first
+        # HINT: Run unindexed terms (QUERY_FIELDS value False) and NOT children as filters over the narrowed candidates
+        # HINT: An "and" needs a scan only when none of its children yields a candidate set
+        # HINT: An "or" needs a scan as soon as one child does, since the union must include that branch
+        # HINT: A NOT or an unindexed term with no candidate set from an enclosing "and" also needs a scan
+        pass
+    
+    def execute(self, query):
+        """
+        Run a query.
+        
+        Args:
+            query: Query text or a syntax tree from parse_query()
+            
+        Returns:
+            dict: Dictionary of matching books
+        """
+        # TODO: Refresh the index with library.get_view(INDEX_VIEW_NAME), evaluate the plan, and look up the books
+        # HINT: Stop intersecting as soon as the candidate set becomes empty
+        pass
+    
+    def explain(self, query):
+        """
+        Describe how a query would run.
+        
+        Args:
+            query: Query text or a syntax tree from parse_query()
+            
+        Returns:
+            str: Indented plan with one line per step, its access method (index or scan) and estimated rows
+        """
+        # TODO: Format the tree returned by plan()
+        pass
+
+
+class BookView:
+    """Class giving read-only, zero-copy access to one record of a CatalogFile."""
+    
+    __slots__ = ("_catalog", "_index")
+    
+    def __init__(self, catalog, index):
+        """
+        Initialize a BookView object.
+        
+        Args:
+            catalog: CatalogFile object holding the record
+            index: Record index inside the catalog
+        """
+        # TODO: Initialize the slot attributes
+        pass
+    
+    @property
+    def book_id(self):
+        """Get the book ID."""
+        # TODO: Decode the book_id string from the catalog string heap
+        pass
+    
+    @property
+    def title(self):
+        """Get the book title."""
+        # TODO: Decode the title string from the catalog string heap
+        pass
+    
+    @property
+    def author(self):
+        """Get the book author."""
+        # TODO: Decode the author string from the catalog string heap
+        pass
+    
+    @property
+    def genre(self):
+        """Get the book genre."""
+        # TODO: Decode the genre string from the catalog string heap
+        pass
+    
+    @property
+    def publication_year(self):
+        """Get the book publication year."""
+        # TODO: Read the publication year field of the record
+        pass
+    
+    @property
+    def is_available(self):
+        """Get the book availability status."""
+        # TODO: Read the availability of this index from the catalog availability state
+        pass
+    
+    def display_info(self):
+        """
+        Display book information.
+        
+        Returns:
+            str: Formatted string with book information
+        """
+        # TODO: Return the same format as Book.display_info()
+        pass
+
+
+class SharedAvailabilityBitmap:
+    """Class storing book availability bits in shared memory visible to every worker process."""
+    
+    def __init__(self, size, name=None, create=True, stripes=64):
+        """
+        Initialize a SharedAvailabilityBitmap object.
+        
+        Args:
+            size: Number of books tracked by the bitmap
+            name: Name of the shared memory block, or None to generate one
+            create: Whether to create the block or attach to an existing one read-only
+            stripes: Number of locks guarding disjoint groups of bytes
+        """
+        # Validate size and stripes
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("Size must be a positive integer")
+            
+        if not isinstance(stripes, int) or stripes <= 0:
+            raise ValueError("Number of stripes must be a positive integer")
+            
+        # TODO: Create or attach to the shared memory block
+        # HINT: Import multiprocessing and multiprocessing.shared_memory inside this method
+        # HINT: Allocate (size + 7) // 8 bytes and set every bit to 1 when creating the block
+        # HINT: Create a list of multiprocessing.Lock objects; byte i is guarded by lock i % stripes
+        # HINT: Create the bitmap before forking workers so they inherit the same locks
+        # HINT: When attaching with create=False, create no locks; locks made here would not exclude any other process
+        pass
+    
+    @property
+    def name(self):
+        """Get the name of the shared memory block."""
+        # TODO: Return the shared memory name
+        pass
+    
+    def _lock_for(self, index):
+        """
+        Get the lock guarding a bit.
+        
+        Args:
+            index: Bit index
+            
+        Returns:
+            Lock: Lock of the stripe holding the bit
+        """
+        # TODO: Return the lock for byte index // 8
+        pass
+    
+    def is_available(self, index):
+        """
+        Read a bit without locking.
+        
+        Args:
+            index: Bit index
+            
+        Returns:
+            bool: True if the bit is set, False otherwise
+        """
+        # TODO: Test bit index % 8 of byte index // 8
+        pass
+    
+    def compare_and_set(self, index, expected, value):
+        """
+        Set a bit only if it currently has the expected value.
+        
+        Args:
+            index: Bit index
+            expected: Expected current value
+            value: New value
+            
+        Returns:
+            bool: True if the bit was updated, False otherwise
+        """
+        # TODO: Hold the stripe lock while reading and writing the byte
+        # HINT: Raise IndexError if index is outside the bitmap
+        # HINT: Raise ValueError if the bitmap was attached by name, since it has no shared locks to write under
+        pass
+    
+    def try_checkout(self, index):
+        """
+        Atomically mark a book as checked out.
+        
+        Args:
+            index: Bit index of the book
+            
+        Returns:
+            bool: True if the book was available and is now checked out, False otherwise
+        """
+        # TODO: Return compare_and_set(index, True, False)
+        pass
+    
+    def release(self, index):
+        """
+        Atomically mark a book as returned.
+        
+        Args:
+            index: Bit index of the book
+            
+        Returns:
+            bool: True if the book was checked out and is now available, False otherwise
+        """
+        # TODO: Return compare_and_set(index, False, True)
+        pass
+    
+    def close(self):
+        """Detach from the shared memory block."""
+        # TODO: Close the shared memory block
+        pass
+    
+    def unlink(self):
+        """Destroy the shared memory block once every process has closed it."""
+        # TODO: Unlink the shared memory block
+        pass
+
+
+class CatalogFile:
+    """Class reading a memory-mapped, read-only catalog of fixed-width records and a string heap."""
+    
+    MAGIC = b"LIBCAT01"
+    HEADER_FORMAT = "<8sQQ"  # magic, record count, string heap offset
+    RECORD_FORMAT = "<IIIIIIIIi"  # (offset, length) of book_id, title, author, genre, then publication_year
+    
+    @staticmethod
+    def write(books, path):
+        """
+        Write books to a catalog file.
+        
+        Args:
+            books: Iterable of Book objects
+            path: Path of the catalog file
+            
+        Returns:
+            int: Number of records written
+        """
+        # Check for None
+        if books is None:
+            raise ValueError("Books cannot be None")
+            
+        # TODO: Write the header, one RECORD_FORMAT record per book sorted by book_id, then the string heap
+        # HINT: Import struct inside this method and use struct.pack()
+        # HINT: Store every distinct string once in the heap as UTF-8 and reuse its (offset, length)
+        pass
+    
+    def __init__(self, path, availability=None):
+        """
+        Initialize a CatalogFile object.
+        
+        Args:
+            path: Path of the catalog file
+            availability: SharedAvailabilityBitmap shared with other processes, or None for per-process state
+        """
+        # TODO: Open the file and map it read-only
+        # HINT: Import mmap inside this method and use mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        # HINT: Raise ValueError if the header does not start with MAGIC
+        # HINT: Keep availability in a per-process bytearray with one byte per record, initialized to 1
+        # HINT: Use the given SharedAvailabilityBitmap instead when availability is not None
+        pass
+    
+    def __len__(self):
+        """
+        Get the number of records.
         
         Returns:
-            dict: Dictionary of all members
+            int: Number of records in the catalog
         """
-        # TODO: Return a copy of the members dictionary
+        # TODO: Return the record count read from the header
+        pass
+    
+    def _record(self, index):
+        """
+        Unpack one fixed-width record.
+        
+        Args:
+            index: Record index
+            
+        Returns:
+            tuple: Unpacked RECORD_FORMAT fields
+        """
+        # TODO: Use struct.unpack_from() at the record offset without copying the mapping
+        pass
+    
+    def _string(self, offset, length):
+        """
+        Decode a string from the string heap.
+        
+        Args:
+            offset: Offset of the string inside the heap
+            length: Length of the string in bytes
+            
+        Returns:
+            str: Decoded string
+        """
+        # TODO: Decode a memoryview slice of the mapping as UTF-8
+        pass
+    
+    def get(self, index):
+        """
+        Get a view of a record by index.
+        
+        Args:
+            index: Record index
+            
+        Returns:
+            BookView: View of the record
+        """
+        # Validate index
+        if not 0 <= index < len(self):
+            raise IndexError("Catalog index out of range")
+            
+        # TODO: Return a BookView for index
+        pass
+    
+    def find(self, book_id):
+        """
+        Get a view of a record by book ID.
+        
+        Args:
+            book_id: ID of the book
+            
+        Returns:
+            BookView: View of the record if found, None otherwise
+        """
+        # TODO: Binary search the records, which are sorted by book_id
+        pass
+    
+    def is_available(self, index):
+        """
+        Get the availability of a record.
+        
+        Args:
+            index: Record index
+            
+        Returns:
+            bool: True if the book is available, False otherwise
+        """
+        # TODO: Read the availability state for index
+        pass
+    
+    def set_available(self, index, value):
+        """
+        Set the availability of a record.
+        
+        Args:
+            index: Record index
+            value: New availability status
+        """
+        # TODO: Write the availability state for index
+        pass
+    
+    def close(self):
+        """Unmap the catalog and close the file."""
+        # TODO: Close the mapping and the file handle
+        pass
+
+
+def measure_intern_savings(records):
+    """
+    Measure memory saved by interning author and genre strings.
+    
+    Args:
+        records: Iterable of (author, genre) string pairs as read from a catalog dump
+        
+    Returns:
+        dict: Bytes used without pooling, bytes used with pooling, and bytes saved
+    """
+    # TODO: Compare the size of separate string objects with the size of one pooled copy per value plus codes
+    # HINT: Import sys inside this function and use sys.getsizeof() on each string
+    # HINT: Return a dictionary with keys "plain_bytes", "pooled_bytes" and "saved_bytes"
+    pass
+
+
+def benchmark_hold_churn(operations=100000, books=1000, members=10000, seed=0):
+    """
+    Measure hold queue throughput under a random mix of holds, cancels and handoffs.
+    
+    Args:
+        operations: Number of operations to run
+        books: Number of distinct book IDs
+        members: Number of distinct member IDs
+        seed: Seed for the random number generator
+        
+    Returns:
+        float: Operations per second
+    """
+    # Validate operations
+    if operations <= 0:
+        raise ValueError("Number of operations must be positive")
+        
+    # TODO: Drive a HoldRegistry with place_hold, cancel_hold, cancel_all and next_member calls
+    # HINT: Import random and time inside this function and use random.Random(seed) and time.perf_counter()
+    pass
+
+
+def benchmark_cross_process_checkout(processes=4, books=10000, operations=100000):
+    """
+    Measure checkout and return throughput on a SharedAvailabilityBitmap from several processes.
+    
+    Args:
+        processes: Number of worker processes
+        books: Number of bits in the bitmap
+        operations: Number of try_checkout/release pairs per process
+        
+    Returns:
+        float: Successful checkouts per second across all processes
+    """
+    # Validate processes
+    if processes <= 0:
+        raise ValueError("Number of processes must be positive")
+        
+    # TODO: Create a bitmap, start the workers with multiprocessing.Process and time them with time.perf_counter()
+    # HINT: Each worker picks random indexes, calls try_checkout() and release(), and reports its success count through a multiprocessing.Queue
+    # HINT: Pass the bitmap object itself to each Process, not its name, so every worker shares its locks
+    # HINT: Close and unlink the bitmap when the benchmark ends
+    pass
+
+
+BATCH_COMMANDS = {
+    "add_book": ("book_id", "title", "author", "genre", "publication_year"),
+    "add_fiction": ("book_id", "title", "author", "genre", "publication_year", "fiction_type"),
+    "add_nonfiction": ("book_id", "title", "author", "genre", "publication_year", "subject"),
+    "add_member": ("member_id", "name", "email"),
+    "checkout": ("book_id", "member_id"),
+    "return": ("book_id", "member_id"),
+    "display_books": (),
+    "display_members": (),
+    "search_title": ("title",),
+    "search_author": ("author",),
+    "query": ("text",),
+}
+
+
+def parse_command(line):
+    """
+    Parse one batch command line.
+    
+    Args:
+        line: JSON object such as {"op": "checkout", "book_id": "B001", "member_id": "M001"}
+              or DSL text such as: checkout B001 M001
+        
+    Returns:
+        tuple: Command name and dictionary of arguments, or None for blank and comment lines
+    """
+    # TODO: Implement command parsing
+    # HINT: Skip blank lines and lines starting with "#"
+    # HINT: Lines starting with "{" are JSON; import json inside this function and read the "op" key
+    # HINT: Otherwise import shlex inside this function and split the line so quoted titles stay together
+    # HINT: Map positional DSL arguments to the names in BATCH_COMMANDS and convert publication_year to int
+    # HINT: Raise ValueError for unknown commands or a wrong number of arguments
+    pass
+
+
+def run_batch(library, stream, output=None):
+    """
+    Execute batch commands against a library.
+    
+    Args:
+        library: Library object to run the commands against
+        stream: Iterable of command lines, such as an open file or sys.stdin
+        output: Writable text stream for results, or None for sys.stdout
+        
+    Returns:
+        dict: Dictionary with "commands", "errors", "seconds" and "ops_per_second"
+    """
+    # Check for None
+    if library is None:
+        raise ValueError("Library cannot be None")
+        
+    # TODO: Parse and execute every command, writing one result line per command
+    # HINT: Collect result lines in a list and write them with output.writelines() every few thousand commands
+    # HINT: Count a ValueError from parse_command() or from the Library as an error and keep going
+    # HINT: Time the run with time.perf_counter() and write the statistics to sys.stderr at the end
+    pass
+
+
+def measure_startup(runs=5):
+    """
+    Measure the cold import time of this module with python -X importtime.
+    
+    Args:
+        runs: Number of fresh interpreter runs to measure
+        
+    Returns:
+        float: Median cumulative import time of this module in milliseconds
+    """
+    # Validate runs
+    if not isinstance(runs, int) or runs <= 0:
+        raise ValueError("Number of runs must be a positive integer")
+        
+    # TODO: Run sys.executable -X importtime -c "import <module>" in a subprocess for each run
+    # HINT: Import subprocess, statistics and sys inside this function
+    # HINT: Parse the stderr line ending in the module name; its second field is the cumulative time in microseconds
+    pass
+
+
+class LibraryService:
+    """Class exposing a Library over a local HTTP/JSON interface."""
+    
+    STREAM_CHUNK_SIZE = 500  # Books serialized per chunk of a streamed response
+    
+    def __init__(self, library, host="127.0.0.1", port=8080):
+        """
+        Initialize a LibraryService object.
+        
+        Args:
+            library: Library object to serve
+            host: Interface to listen on
+            port: TCP port to listen on, or 0 to pick a free port
+        """
+        # Check for None
+        if library is None:
+            raise ValueError("Library cannot be None")
+            
+        if not isinstance(port, int) or not 0 <= port <= 65535:
+            raise ValueError("Port must be an integer between 0 and 65535")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Create the server lazily in start() so importing this module never imports http.server
+        # HINT: Create a threading.Lock owned by the service to serialize every call into the library
+        pass
+    
+    @property
+    def address(self):
+        """Get the (host, port) the server is bound to."""
+        # TODO: Return the server address, or the configured one before start()
+        pass
+    
+    @staticmethod
+    def book_to_dict(book):
+        """
+        Convert a book to a JSON-serializable dictionary.
+        
+        Args:
+            book: Book object to convert
+            
+        Returns:
+            dict: Dictionary of the book properties
+        """
+        # TODO: Return book_id, title, author, genre, publication_year and is_available
+        # HINT: Add fiction_type or subject for FictionBook and NonFictionBook
+        pass
+    
+    def handle(self, method, path, query, body):
+        """
+        Route one request to the library.
+        
+        Args:
+            method: HTTP method, "GET" or "POST"
+            path: Request path without the query string
+            query: Dictionary of query parameters
+            body: Decoded JSON body for POST requests, or None
+            
+        Returns:
+            tuple: HTTP status code and a JSON-serializable payload, or an iterator of dictionaries to stream
+        """
+        # TODO: Implement request routing
+        # HINT: GET /books/<book_id> -> get_book(), 404 if not found
+        # HINT: GET /books/available -> get_available_books(), streamed as an iterator
+        # HINT: GET /search/title?q=... and GET /search/author?q=... -> search methods, streamed as iterators
+        # HINT: GET /query?q=... -> QueryPlanner.execute(), streamed as an iterator; add explain=1 to return QueryPlanner.explain()
+        # HINT: POST /checkout and POST /return with {"book_id": ..., "member_id": ...} -> {"ok": bool}
+        # HINT: Hold the service lock around every library call, GET and POST; ThreadingHTTPServer runs handlers concurrently
+        # HINT: Reads also change shared state, such as the BookCache LRU order and the sqlite3 connection
+        # HINT: Materialize streamed results into a list while holding the lock, then stream the list after releasing it
+        # HINT: Return 400 for missing parameters or a ValueError, and 404 for unknown paths
+        pass
+    
+    def _make_handler(self):
+        """
+        Build the request handler class bound to this service.
+        
+        Returns:
+            type: Subclass of http.server.BaseHTTPRequestHandler
+        """
+        # TODO: Import http.server, json and urllib.parse here and define the handler class inside this method
+        # HINT: Set protocol_version = "HTTP/1.1" so clients can keep connections alive
+        # HINT: Send a Content-Length for plain payloads and "Transfer-Encoding: chunked" for iterators
+        # HINT: Write streamed results as one JSON array, STREAM_CHUNK_SIZE items per chunk
+        # HINT: Override log_message() to do nothing so logging does not dominate latency
+        pass
+    
+    def start(self):
+        """
+        Start serving in a background thread.
+        
+        Returns:
+            tuple: The (host, port) the server is bound to
+        """
+        # TODO: Create a http.server.ThreadingHTTPServer with _make_handler() and run serve_forever() in a daemon thread
+        pass
+    
+    def serve_forever(self):
+        """Serve requests in the calling thread until interrupted."""
+        # TODO: Create the server like start() and call serve_forever() directly
+        pass
+    
+    def shutdown(self):
+        """Stop the server and release the socket."""
+        # TODO: Call shutdown() and server_close() on the server
+        pass
+
+
+def run_load_test(host, port, path="/books/available", requests=10000, concurrency=8):
+    """
+    Load test a running LibraryService over keep-alive connections.
+    
+    Args:
+        host: Host of the service
+        port: Port of the service
+        path: Request path to fetch
+        requests: Total number of requests
+        concurrency: Number of client threads, each with one persistent connection
+        
+    Returns:
+        dict: Dictionary with "requests", "errors", "requests_per_second", "p50_ms", "p95_ms" and "p99_ms"
+    """
+    # Validate requests and concurrency
+    if requests <= 0 or concurrency <= 0:
+        raise ValueError("Requests and concurrency must be positive")
+        
+    # TODO: Split the requests across threads that reuse one http.client.HTTPConnection each
+    # HINT: Record the latency of every request with time.perf_counter() and read the full response body
+    # HINT: Compute the percentiles from the sorted list of latencies
+    pass
+
+
+class WorkloadGenerator:
+    """Class synthesizing or replaying library transactions and measuring their latency."""
+    
+    DEFAULT_MIX = {"checkout": 0.4, "return": 0.35, "search_title": 0.15, "search_author": 0.1}
+    
+    def __init__(self, library, seed=0, zipf_exponent=1.1, mix=None):
+        """
+        Initialize a WorkloadGenerator object.
+        
+        Args:
+            library: Library object the workload runs against
+            seed: Seed for the random number generator
+            zipf_exponent: Exponent s of the Zipf distribution of book popularity
+            mix: Dictionary mapping operation names to relative weights, or None for DEFAULT_MIX
+        """
+        # Check for None
+        if library is None:
+            raise ValueError("Library cannot be None")
+            
+        if zipf_exponent <= 0:
+            raise ValueError("Zipf exponent must be positive")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Import random inside this method and keep a random.Random(seed)
+        # HINT: Handle default value for mix and reject operations that are not in BATCH_COMMANDS
+        pass
+    
+    def populate(self, books, members):
+        """
+        Fill the library with synthetic books and members.
+        
+        Args:
+            books: Number of books to add
+            members: Number of members to add
+        """
+        # Validate counts
+        if books <= 0 or members <= 0:
+            raise ValueError("Number of books and members must be positive")
+            
+        # TODO: Add books with IDs "B<n>" and members with IDs "M<n>" using library.load_books() and add_member()
+        # HINT: Precompute the cumulative Zipf weights 1 / rank ** zipf_exponent once for bisect-based sampling
+        pass
+    
+    def generate(self, operations, burst_factor=1.0):
+        """
+        Generate a synthetic stream of operations.
+        
+        Args:
+            operations: Number of operations to generate
+            burst_factor: Ratio between the arrival rate inside a burst and outside it; 1.0 means no bursts
+            
+        Returns:
+            list: Tuples of (arrival offset in seconds, command name, arguments dictionary)
+        """
+        # Validate operations
+        if operations <= 0:
+            raise ValueError("Number of operations must be positive")
+            
+        # TODO: Pick each operation from the mix and each book with bisect over the cumulative Zipf weights
+        # HINT: Draw inter-arrival gaps with random.expovariate() and switch between burst and quiet periods
+        # HINT: Only generate a return for a book that an earlier generated checkout gave to a member
+        pass
+    
+    @staticmethod
+    def load_log(stream):
+        """
+        Load a recorded transaction log written in the batch command format.
+        
+        Args:
+            stream: Iterable of command lines
+            
+        Returns:
+            list: Tuples of (arrival offset in seconds, command name, arguments dictionary)
+        """
+        # TODO: Use parse_command() on every line
+        # HINT: Use the optional "ts" field of JSON lines as the arrival offset, otherwise 0.0
+        pass
+    
+    def run(self, workload, mode="closed", rate=None):
+        """
+        Execute a workload against the library.
+        
+        Args:
+            workload: Tuples produced by generate() or load_log()
+            mode: "closed" to issue the next operation when the previous one finishes, "open" to follow arrival times
+            rate: Multiplier for the arrival times in open mode, or None to replay them unchanged
+            
+        Returns:
+            dict: Dictionary with "operations", "seconds", "ops_per_second", and "p50_ms", "p95_ms", "p99_ms" per operation name
+        """
+        # Validate mode
+        if mode not in ("closed", "open"):
+            raise ValueError("Mode must be 'closed' or 'open'")
+            
+        # TODO: Dispatch each operation to the matching Library method and time it with time.perf_counter()
+        # HINT: In open mode, sleep until each arrival time and measure latency from the scheduled time, not the start of the call
+        pass
+
+
+class MethodProfiler:
+    """Class that wraps selected Library methods with cProfile or a sampling profiler at runtime."""
+    
+    MODES = ("cprofile", "sample")
+    
+    def __init__(self, library, sample_interval=0.005):
+        """
+        Initialize a MethodProfiler object.
+        
+        Args:
+            library: Library object whose methods are profiled
+            sample_interval: Seconds between samples in sampling mode
+        """
+        # Check for None
+        if library is None:
+            raise ValueError("Library cannot be None")
+            
+        if sample_interval <= 0:
+            raise ValueError("Sample interval must be positive")
+            
+        # TODO: Initialize all the private attributes
+        # HINT: Keep a dictionary of the original bound methods that were replaced
+        # HINT: Keep a dictionary counting collapsed stacks ("frame;frame;frame" -> samples)
+        # HINT: Keep a threading.local() holding the wrapped-call nesting depth of each thread
+        pass
+    
+    @property
+    def active(self):
+        """Get whether profiling is currently enabled."""
+        # TODO: Return True while any method is wrapped
+        pass
+    
+    def enable(self, method_names, mode="cprofile", duration=None):
+        """
+        Start profiling the given methods.
+        
+        Args:
+            method_names: Names of Library methods such as "checkout_book" or "search_book_by_title"
+            mode: "cprofile" for deterministic profiling or "sample" for the sampling profiler
+            duration: Seconds after which profiling disables itself, or None to run until disable()
+        """
+        # Validate mode
+        if mode not in self.MODES:
+            raise ValueError("Mode must be 'cprofile' or 'sample'")
+            
+        # TODO: Replace each method on the library instance with a wrapper
+        # HINT: Setting an instance attribute shadows the class method, so other Library objects are unaffected
+        # HINT: In cprofile mode, import cProfile here and call profile.enable()/disable() around the original method
+        # HINT: In sample mode, record the calling thread ID while the method runs and start _sample_loop() in a daemon thread
+        # HINT: Wrapped methods call each other, e.g. checkout_books() -> get_book(), so increment the thread's depth on entry
+        # HINT: Only enable or record at depth 1 and only disable or forget in a finally block when the depth returns to 0
+        # HINT: Use threading.Timer(duration, self.disable) when duration is given
+        pass
+    
+    def _sample_loop(self):
+        """Collect stacks of threads that are inside a wrapped method until profiling stops."""
+        # TODO: Every sample_interval, read sys._current_frames() for the recorded thread IDs
+        # HINT: Walk f_back to build "module:function" names from outermost to innermost and count the joined stack
+        pass
+    
+    def disable(self):
+        """Stop profiling and restore the original methods."""
+        # TODO: Delete the instance attributes that shadow the class methods and stop the sampler thread
+        pass
+    
+    def dump(self, path):
+        """
+        Write the collected profile.
+        
+        Args:
+            path: Output path; pstats data in cprofile mode, collapsed stacks for flamegraph.pl in sample mode
+            
+        Returns:
+            int: Number of profiled calls in cprofile mode or number of samples in sample mode
+        """
+        # TODO: Use profile.dump_stats(path) or write one "stack count" line per collapsed stack
         pass
 
 
-def main():
-    """Main function to run the library management system."""
+def main(argv=None):
+    """
+    Main function to run the library management system.
+    
+    Args:
+        argv: Command line arguments, or None to use sys.argv[1:]
+    """
     # TODO: Implement the main function
+    # HINT: Import argparse inside this function and accept "--batch PATH", where PATH "-" means stdin
+    # HINT: With --batch, create a library and return after run_batch() instead of showing the menu
+    # HINT: Accept "--serve HOST:PORT" and call LibraryService(library, host, port).serve_forever()
     # HINT: Create a library and implement a menu-driven interface with the following options:
     # 1. Add New Book
     # 2. Add New Member
@@ -5,6 +5,7 @@ import sys
 import io
 import contextlib
 import datetime
+import subprocess
 from test.TestUtils import TestUtils
 
 def check_file_exists(filename):
@@ -311,6 +312,59 @@ class TestSystemBoundaries(unittest.TestCase):
         except Exception as e:
             self.test_obj.yakshaAssert("TestSystemBoundaries", False, "boundary")
             print("TestSystemBoundaries = Failed")
+    
+    def test_startup_time(self):
+        """Test that importing the module stays within the cold start budget."""
+        try:
+            # Check if module can be imported
+            if self.module_obj is None:
+                self.test_obj.yakshaAssert("TestStartupTime", False, "boundary")
+                print("TestStartupTime = Failed")
+                return
+            
+            errors = []
+            module_name = self.module_obj.__name__
+            target_ms = getattr(self.module_obj, "STARTUP_TARGET_MS", 50)
+            blocklist = getattr(self.module_obj, "EAGER_IMPORT_BLOCKLIST", ())
+            project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            
+            # Test cumulative import time reported by python -X importtime
+            timings = []
+            for _ in range(3):
+                result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                                        cwd=project_dir, capture_output=True, text=True, timeout=60)
+                for line in result.stderr.splitlines():
+                    fields = line.split("|")
+                    if len(fields) == 3 and fields[2].strip() == module_name:
+                        timings.append(int(fields[1].strip()) / 1000.0)
+            
+            if not timings:
+                errors.append(f"Could not measure import time of {module_name}")
+            elif min(timings) > target_ms:
+                errors.append(f"Importing {module_name} took {min(timings):.1f} ms, target is {target_ms} ms")
+            
+            # Test that optional subsystems are not imported eagerly
+            probe = (f"import sys, {module_name}; "
+                     f"print(','.join(name for name in {tuple(blocklist)!r} if name in sys.modules))")
+            result = subprocess.run([sys.executable, "-c", probe],
+                                    cwd=project_dir, capture_output=True, text=True, timeout=60)
+            eager = result.stdout.strip()
+            if result.returncode != 0:
+                errors.append(f"Could not import {module_name} in a fresh interpreter")
+            elif eager:
+                errors.append(f"Importing {module_name} eagerly imported optional modules: {eager}")
+            
+            # Final assertion
+            if errors:
+                self.test_obj.yakshaAssert("TestStartupTime", False, "boundary")
+                print("TestStartupTime = Failed")
+            else:
+                self.test_obj.yakshaAssert("TestStartupTime", True, "boundary")
+                print("TestStartupTime = Passed")
+                
+        except Exception as e:
+            self.test_obj.yakshaAssert("TestStartupTime", False, "boundary")
+            print("TestStartupTime = Failed")
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -809,6 +809,269 @@ class TestFunctional(unittest.TestCase):
             self.test_obj.yakshaAssert("TestLibrarySearchFunctions", False, "functional")
             print("TestLibrarySearchFunctions = Failed")
     
+    def test_library_batch_checkout_return(self):
+        """Test batch checkout and return with all-or-nothing semantics."""
+        try:
+            # Check if module exists
+            if self.module_obj is None:
+                self.test_obj.yakshaAssert("TestLibraryBatchCheckoutReturn", False, "functional")
+                print("TestLibraryBatchCheckoutReturn = Failed")
+                return
+            
+            # Check required classes exist
+            required_classes = ["Library", "Book", "Member"]
+            missing_classes = []
+            for class_name in required_classes:
+                if not check_class_exists(self.module_obj, class_name):
+                    missing_classes.append(class_name)
+            
+            if missing_classes:
+                self.test_obj.yakshaAssert("TestLibraryBatchCheckoutReturn", False, "functional")
+                print("TestLibraryBatchCheckoutReturn = Failed")
+                return
+            
+            # Create a list to collect errors
+            errors = []
+            
+            # Create library, books, and member
+            library = safely_create_instance(self.module_obj, "Library", 
+                                          "Batch Library", "Batch St")
+            member = safely_create_instance(self.module_obj, "Member", 
+                                         "M201", "Kiosk User", "kiosk@example.com")
+            books = []
+            for i in range(1, 5):
+                book = safely_create_instance(self.module_obj, "Book", 
+                                           f"B20{i}", f"Batch Book {i}", "Author", "Fiction", 2020)
+                if book is not None:
+                    books.append(book)
+            
+            if library is None or member is None or len(books) < 4:
+                errors.append("Could not create Library, Member or Book instances for batch test")
+            else:
+                safely_call_method(library, "add_member", member)
+                for book in books:
+                    safely_call_method(library, "add_book", book)
+                
+                # Test batch exceeding the limit is rejected as a whole
+                over_limit = safely_call_method(library, "checkout_books", "M201", ["B201", "B202", "B203", "B204"])
+                if over_limit is None:
+                    errors.append("Library.checkout_books method not implemented or failed")
+                elif over_limit != False:
+                    errors.append(f"Library.checkout_books over the limit returned {over_limit}, expected False")
+                elif any(safely_get_attribute(book, "is_available") != True for book in books):
+                    errors.append("Library.checkout_books should not check out any book when the batch fails")
+                
+                # Test batch with an unknown book is rejected as a whole
+                unknown = safely_call_method(library, "checkout_books", "M201", ["B201", "B999"])
+                if unknown is not None and unknown != False:
+                    errors.append(f"Library.checkout_books with unknown book returned {unknown}, expected False")
+                
+                # Test successful batch
+                batch_result = safely_call_method(library, "checkout_books", "M201", ["B201", "B202", "B203"])
+                if batch_result is None:
+                    errors.append("Library.checkout_books method not implemented or failed")
+                elif batch_result != True:
+                    errors.append(f"Library.checkout_books returned {batch_result}, expected True")
+                else:
+                    books_borrowed = safely_get_attribute(member, "books_borrowed")
+                    if books_borrowed is None or sorted(books_borrowed) != ["B201", "B202", "B203"]:
+                        errors.append(f"Member.books_borrowed after batch checkout returned {books_borrowed}")
+                    
+                    # Test batch return
+                    return_result = safely_call_method(library, "return_books", "M201", ["B201", "B202"])
+                    if return_result is None:
+                        errors.append("Library.return_books method not implemented or failed")
+                    elif return_result != True:
+                        errors.append(f"Library.return_books returned {return_result}, expected True")
+                    else:
+                        books_borrowed = safely_get_attribute(member, "books_borrowed")
+                        if books_borrowed != ["B203"]:
+                            errors.append(f"Member.books_borrowed after batch return returned {books_borrowed}, expected ['B203']")
+                        if safely_get_attribute(books[0], "is_available") != True:
+                            errors.append("Book should be available after batch return")
+            
+            # Final result checking
+            if errors:
+                self.test_obj.yakshaAssert("TestLibraryBatchCheckoutReturn", False, "functional")
+                print("TestLibraryBatchCheckoutReturn = Failed")
+            else:
+                self.test_obj.yakshaAssert("TestLibraryBatchCheckoutReturn", True, "functional")
+                print("TestLibraryBatchCheckoutReturn = Passed")
+                
+        except Exception as e:
+            self.test_obj.yakshaAssert("TestLibraryBatchCheckoutReturn", False, "functional")
+            print("TestLibraryBatchCheckoutReturn = Failed")
+    
+    def test_library_borrower_index(self):
+        """Test the book to borrower index and id-only returns."""
+        try:
+            # Check if module exists
+            if self.module_obj is None:
+                self.test_obj.yakshaAssert("TestLibraryBorrowerIndex", False, "functional")
+                print("TestLibraryBorrowerIndex = Failed")
+                return
+            
+            # Check required classes exist
+            required_classes = ["Library", "Book", "Member"]
+            missing_classes = []
+            for class_name in required_classes:
+                if not check_class_exists(self.module_obj, class_name):
+                    missing_classes.append(class_name)
+            
+            if missing_classes:
+                self.test_obj.yakshaAssert("TestLibraryBorrowerIndex", False, "functional")
+                print("TestLibraryBorrowerIndex = Failed")
+                return
+            
+            # Create a list to collect errors
+            errors = []
+            
+            # Create library, book, and member
+            library = safely_create_instance(self.module_obj, "Library", 
+                                          "Index Library", "Index St")
+            book = safely_create_instance(self.module_obj, "Book", 
+                                       "B301", "Indexed Book", "Author", "Fiction", 2020)
+            member = safely_create_instance(self.module_obj, "Member", 
+                                         "M301", "Indexed Member", "indexed@example.com")
+            
+            if library is None or book is None or member is None:
+                errors.append("Could not create Library, Book or Member instances for borrower index test")
+            else:
+                safely_call_method(library, "add_book", book)
+                safely_call_method(library, "add_member", member)
+                
+                # Test who_has before checkout; call it directly because
+                # safely_call_method turns a None result into True
+                if not check_function_exists(library, "who_has"):
+                    errors.append("Library.who_has method not found")
+                elif library.who_has("B301") is not None:
+                    errors.append("Library.who_has should return None for a book on the shelf")
+                
+                checkout_result = safely_call_method(library, "checkout_book", "B301", "M301")
+                if checkout_result != True:
+                    errors.append(f"Library.checkout_book returned {checkout_result}, expected True")
+                else:
+                    # Test who_has after checkout
+                    holder = safely_call_method(library, "who_has", "B301")
+                    if holder != "M301":
+                        errors.append(f"Library.who_has returned {holder}, expected 'M301'")
+                    
+                    # Test consistency check
+                    problems = safely_call_method(library, "check_consistency")
+                    if problems is None:
+                        errors.append("Library.check_consistency method not implemented or failed")
+                    elif problems != []:
+                        errors.append(f"Library.check_consistency returned {problems}, expected []")
+                    
+                    # Test id-only return
+                    return_result = safely_call_method(library, "return_book_by_id", "B301")
+                    if return_result is None:
+                        errors.append("Library.return_book_by_id method not implemented or failed")
+                    elif return_result != True:
+                        errors.append(f"Library.return_book_by_id returned {return_result}, expected True")
+                    else:
+                        if check_function_exists(library, "who_has") and library.who_has("B301") is not None:
+                            errors.append("Library.who_has should return None after the book is returned")
+                        if safely_get_attribute(member, "books_borrowed") != []:
+                            errors.append("Member.books_borrowed should be empty after return_book_by_id")
+                
+                # Test id-only return of a book that is not checked out
+                if safely_call_method(library, "return_book_by_id", "B301") == True:
+                    errors.append("Library.return_book_by_id should return False for a book on the shelf")
+            
+            # Final result checking
+            if errors:
+                self.test_obj.yakshaAssert("TestLibraryBorrowerIndex", False, "functional")
+                print("TestLibraryBorrowerIndex = Failed")
+            else:
+                self.test_obj.yakshaAssert("TestLibraryBorrowerIndex", True, "functional")
+                print("TestLibraryBorrowerIndex = Passed")
+                
+        except Exception as e:
+            self.test_obj.yakshaAssert("TestLibraryBorrowerIndex", False, "functional")
+            print("TestLibraryBorrowerIndex = Failed")
+    
+    def test_library_normalized_search(self):
+        """Test accent, case and punctuation insensitive search."""
+        try:
+            # Check if module exists
+            if self.module_obj is None:
+                self.test_obj.yakshaAssert("TestLibraryNormalizedSearch", False, "functional")
+                print("TestLibraryNormalizedSearch = Failed")
+                return
+            
+            # Check required classes exist
+            required_classes = ["Library", "Book"]
+            missing_classes = []
+            for class_name in required_classes:
+                if not check_class_exists(self.module_obj, class_name):
+                    missing_classes.append(class_name)
+            
+            if missing_classes:
+                self.test_obj.yakshaAssert("TestLibraryNormalizedSearch", False, "functional")
+                print("TestLibraryNormalizedSearch = Failed")
+                return
+            
+            # Create a list to collect errors
+            errors = []
+            
+            # Test the normalization helper
+            if check_function_exists(self.module_obj, "normalize_search_key"):
+                key = safely_call_method(self.module_obj, "normalize_search_key", "García  Márquez!")
+                if key != "garcia marquez":
+                    errors.append(f"normalize_search_key('García  Márquez!') returned {key}, expected 'garcia marquez'")
+            else:
+                errors.append("normalize_search_key function not found")
+            
+            # Create library and books for search
+            library = safely_create_instance(self.module_obj, "Library", 
+                                          "Unicode Library", "Unicode St")
+            
+            if library is None:
+                errors.append("Could not create Library instance for normalized search test")
+            else:
+                book_data = [
+                    ("B401", "Cien Años de Soledad", "Gabriel García Márquez", "Fiction", 1967),
+                    ("B402", "L'Étranger", "Albert Camus", "Fiction", 1942),
+                    ("B403", "Der Zauberberg", "Thomas Mann", "Fiction", 1924)
+                ]
+                
+                for book_args in book_data:
+                    book = safely_create_instance(self.module_obj, "Book", *book_args)
+                    if book is not None:
+                        safely_call_method(library, "add_book", book)
+                
+                # Test accent-insensitive author search
+                author_results = safely_call_method(library, "search_book_by_author", "Garcia Marquez")
+                if author_results is None:
+                    errors.append("Library.search_book_by_author method failed")
+                elif not isinstance(author_results, dict) or list(author_results.keys()) != ["B401"]:
+                    errors.append(f"Library.search_book_by_author('Garcia Marquez') returned {author_results}, expected only B401")
+                
+                # Test accent and punctuation insensitive title search
+                title_results = safely_call_method(library, "search_book_by_title", "l etranger")
+                if title_results is None:
+                    errors.append("Library.search_book_by_title method failed")
+                elif not isinstance(title_results, dict) or list(title_results.keys()) != ["B402"]:
+                    errors.append(f"Library.search_book_by_title('l etranger') returned {title_results}, expected only B402")
+                
+                # Test case-insensitive title search still works
+                case_results = safely_call_method(library, "search_book_by_title", "CIEN AÑOS")
+                if not isinstance(case_results, dict) or "B401" not in case_results:
+                    errors.append(f"Library.search_book_by_title('CIEN AÑOS') returned {case_results}, expected B401")
+            
+            # Final result checking
+            if errors:
+                self.test_obj.yakshaAssert("TestLibraryNormalizedSearch", False, "functional")
+                print("TestLibraryNormalizedSearch = Failed")
+            else:
+                self.test_obj.yakshaAssert("TestLibraryNormalizedSearch", True, "functional")
+                print("TestLibraryNormalizedSearch = Passed")
+                
+        except Exception as e:
+            self.test_obj.yakshaAssert("TestLibraryNormalizedSearch", False, "functional")
+            print("TestLibraryNormalizedSearch = Failed")
+    
     def test_integrated_library_functions(self):
         """Test integrated library functionality with multiple operations."""
         try: